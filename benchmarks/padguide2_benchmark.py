@@ -0,0 +1,564 @@
+"""
+Benchmarks for the PadGuide database and monster index.
+
+Only padguide2core and the rpadutils it needs are imported, so the bot doesn't have to be
+running.
+
+The synthetic benchmark builds a database and index from generated PadGuide files, so
+changes to the loading and searching code can be measured repeatably without the bot
+connecting anywhere.
+
+Run from the bot directory, with the cogs installed, so padguide2core can be imported from
+the cogs package and fixtures and results go under data/padguide2:
+
+    PYTHONPATH=. python path/to/benchmarks/padguide2_benchmark.py synthetic [scale ...]
+
+The replay benchmark reruns the ^id queries users have made, recorded by the PadInfo cog,
+against the PadGuide files and nickname overrides the bot last downloaded. It reports
+lookup latency over the distinct queries, which stage resolved the queries, and queries
+which now pick a different monster, or get it from a different stage, than the saved
+baseline:
+
+    PYTHONPATH=. python path/to/benchmarks/padguide2_benchmark.py replay [--save-baseline]
+
+The prefix benchmark times the prefix stages of find_monster on the same queries, against
+the linear scans over every nickname they replaced:
+
+    PYTHONPATH=. python path/to/benchmarks/padguide2_benchmark.py prefix
+
+The batch benchmark times MonsterIndex.find_monsters against calling find_monster on each
+query in a batch of 1,000 of those queries, once with each query distinct and once drawn
+with repeats, and counts which stage resolved them:
+
+    PYTHONPATH=. python path/to/benchmarks/padguide2_benchmark.py batch
+"""
+import argparse
+from collections import defaultdict
+from datetime import datetime
+import gc
+import json
+import os
+import random
+import sys
+import time
+
+from cogs.padguide2core import *
+
+
+BENCHMARK_DIR = 'data/padguide2/benchmark'
+BENCHMARK_RESULTS_PATH = 'data/padguide2/benchmark_results.json'
+
+# Multiples of the size of the live PadGuide tables
+BENCHMARK_SCALES = [1, 5, 20]
+
+# Roughly the number of monsters in PadGuide today
+BENCHMARK_BASE_MONSTERS = 4000
+
+BENCHMARK_NAME_WORDS = [
+    'dragon', 'king', 'metal', 'sonia', 'ra', 'zeus', 'hera', 'kali', 'athena', 'ares', 'loki',
+    'odin', 'thor', 'freyja', 'valkyrie', 'amaterasu', 'tsukuyomi', 'susano', 'izanagi',
+    'izanami', 'lakshmi', 'parvati', 'indra', 'vishnu', 'shiva',
+]
+
+# A fixed mix of lookups against the generated names: exact names, nicknames with
+# prefixes, prefix and substring matches, typos, monster numbers, and misses
+BENCHMARK_QUERIES = [
+    'sonia', 'awoken ra', 'reincarnated hera', 'r sonia', 'zeus', 'kali', 'odin', 'thor',
+    'green odin', 'blue zeus', 'l kali', 'dark loki', 'valk', 'amat', 'izan', 'vish',
+    'odn', 'athen', 'zues', 'freya', '1', '17', '123', '2500', 'dragon king', 'king metal',
+    'metal dragon', 'ドラゴン12', 'ドラゴン', 'shiva 3', 'xyzzy', 'not a monster',
+]
+
+
+def write_benchmark_fixtures(data_dir: str, scale: int, seed: int=0):
+    """Writes a synthetic PadGuide data set, scale times the size of the live one."""
+    rnd = random.Random(seed)
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+
+    monster_count = BENCHMARK_BASE_MONSTERS * scale
+    skill_count = 3 * monster_count
+    series_count = 200 * scale
+    dungeon_count = 300 * scale
+    dungeon_monster_count = 10 * monster_count
+    egg_instance_count = 50 * scale
+
+    def row(**kwargs):
+        kwargs['TSTAMP'] = '1'
+        return {k: str(v) for k, v in kwargs.items()}
+
+    tables = {}
+    tables[PgAttribute.file_name()] = [
+        row(TA_SEQ=a.value, TA_NAME_US=a.name) for a in Attribute]
+    type_names = ['Evolve', 'Balance', 'Physical', 'Healer', 'Dragon', 'God', 'Attacker',
+                  'Devil', 'Machine', 'Enhance']
+    tables[PgType.file_name()] = [row(TT_SEQ=i, TT_NAME_US=n) for i, n in enumerate(type_names)]
+    tables[PgSeries.file_name()] = [
+        row(TSR_SEQ=i, NAME_US='Series {}'.format(i), DEL_YN='N')
+        for i in range(1, series_count + 1)]
+
+    skill_descs = [
+        'Change all orbs to fire, water and wood orbs.',
+        'Change dark orbs to heart orbs; Increase ATK',
+        'Change the top row to light orbs',
+        'Deal damage to all enemies',
+    ]
+    tables[PgSkill.file_name()] = [
+        row(TS_SEQ=i, TS_NAME_US='Skill {}'.format(i), TS_DESC_US=rnd.choice(skill_descs),
+            TURN_MIN=5, TURN_MAX=10)
+        for i in range(1, skill_count + 1)]
+    tables[PgSkillLeaderData.file_name()] = [
+        row(TS_SEQ=i, LEADER_DATA='2/4///|3/2//6,1,2/') for i in range(1, skill_count + 1, 3)]
+
+    monsters, infos, prices, add_infos, evolutions, materials = [], [], [], [], [], []
+    monster_no = 1
+    while monster_no <= monster_count:
+        base_name = '{} {} {}'.format(rnd.choice(BENCHMARK_NAME_WORDS).title(),
+                                      rnd.choice(BENCHMARK_NAME_WORDS).title(), monster_no)
+        previous_no = None
+        for evo_idx in range(rnd.randint(1, 5)):
+            if monster_no > monster_count:
+                break
+            name_jp = 'ドラゴン{}'.format(monster_no)
+            prefix = ['', 'Awoken ', 'Reincarnated ', '', ''][evo_idx]
+            monsters.append(row(
+                MONSTER_NO=monster_no, MONSTER_NO_US=monster_no, MONSTER_NO_JP=monster_no,
+                HP_MIN=100, ATK_MIN=100, RCV_MIN=100, HP_MAX=rnd.randint(1000, 6000),
+                ATK_MAX=rnd.randint(500, 3000), RCV_MAX=rnd.randint(0, 800),
+                TS_SEQ_SKILL=rnd.randint(1, skill_count), TS_SEQ_LEADER=rnd.randint(1, skill_count),
+                RARITY=rnd.randint(1, 8), COST=10, EXP=1000000, LEVEL=99,
+                # About a tenth of the monsters are JP only and have no English name
+                TM_NAME_US=name_jp if rnd.random() < 0.1 else prefix + base_name,
+                TM_NAME_JP=name_jp, TA_SEQ=rnd.randint(1, 5), TA_SEQ_SUB=rnd.randint(0, 5),
+                TE_SEQ=1, TT_SEQ=rnd.randint(0, 9), TT_SEQ_SUB=rnd.randint(0, 9),
+                LIMIT_MULT=rnd.choice(['', '10'])))
+            infos.append(row(
+                MONSTER_NO=monster_no, ON_US=rnd.choice([0, 1, 1]),
+                TSR_SEQ=rnd.randint(1, series_count), PAL_EGG=0, RARE_EGG=rnd.choice([0, 1]),
+                HISTORY_US=''))
+            prices.append(row(MONSTER_NO=monster_no, BUY_PRICE=0,
+                              SELL_PRICE=rnd.randint(10, 100000)))
+            if rnd.random() < 0.3:
+                add_infos.append(row(MONSTER_NO=monster_no, SUB_TYPE=rnd.randint(0, 9),
+                                     EXTRA_VAL1=rnd.choice(['', '1', '2'])))
+            if previous_no:
+                tv_seq = len(evolutions) + 1
+                evolutions.append(row(TV_SEQ=tv_seq, MONSTER_NO=previous_no, TO_NO=monster_no,
+                                      TV_TYPE=min(evo_idx - 1, 2)))
+                for order_idx in range(rnd.randint(1, 5)):
+                    materials.append(row(TEM_SEQ=len(materials) + 1, TV_SEQ=tv_seq,
+                                         MONSTER_NO=rnd.randint(1, monster_count),
+                                         ORDER_IDX=order_idx))
+            previous_no = monster_no
+            monster_no += 1
+    tables[PgMonster.file_name()] = monsters
+    tables[PgMonsterInfo.file_name()] = infos
+    tables[PgMonsterPrice.file_name()] = prices
+    tables[PgMonsterAddInfo.file_name()] = add_infos
+    tables[PgEvolution.file_name()] = evolutions
+    tables[PgEvolutionMaterial.file_name()] = materials
+
+    tables[PgAwakening.file_name()] = [
+        row(TMA_SEQ=i, TS_SEQ=rnd.randint(1, skill_count), DEL_YN='N',
+            MONSTER_NO=rnd.randint(1, monster_count), ORDER_IDX=i % 9,
+            IS_SUPER=rnd.choice([0, 1]))
+        for i in range(1, 4 * monster_count)]
+
+    tables[PgDungeon.file_name()] = [
+        row(DUNGEON_SEQ=i, DUNGEON_TYPE=rnd.randint(0, 3), NAME_US='Dungeon {}'.format(i),
+            NAME_JP='D{}'.format(i), TDT_SEQ=1, SHOW_YN=1, ICON_SEQ=1)
+        for i in range(1, dungeon_count + 1)]
+    tables[PgDungeonMonster.file_name()] = [
+        row(TDM_SEQ=i, AMOUNT=1, ATK=100, DEF=10, DROP_NO=rnd.randint(1, monster_count),
+            DUNGEON_SEQ=rnd.randint(1, dungeon_count), FLOOR=1, HP=1000,
+            MONSTER_NO=rnd.randint(1, monster_count), ORDER_IDX=1, TSD_SEQ=1, TURN=1)
+        for i in range(1, dungeon_monster_count + 1)]
+    tables[PgDungeonMonsterDrop.file_name()] = [
+        row(TDMD_SEQ=i, MONSTER_NO=rnd.randint(1, monster_count), STATUS=1,
+            TDM_SEQ=rnd.randint(1, dungeon_monster_count))
+        for i in range(1, monster_count // 2)]
+
+    tables[PgEggInstance.file_name()] = [
+        row(SERVER=rnd.choice(['US', 'JP', '']), DEL_YN='N', SHOW_YN='Y',
+            TEC_SEQ=rnd.randint(1, 2), TET_SEQ=i, TYPE=rnd.randint(0, 1), ORDER_IDX=i,
+            START_DATE='2017-10-17 08:00:00', END_DATE='2017-10-24 07:59:00')
+        for i in range(1, egg_instance_count)]
+    tables[PgEggMonster.file_name()] = [
+        row(DEL_YN='N', MONSTER_NO=rnd.randint(1, monster_count), TEM_SEQ=i,
+            TET_SEQ=rnd.randint(1, egg_instance_count - 1))
+        for i in range(1, 10 * egg_instance_count)]
+    tables[PgEggName.file_name()] = [
+        row(NAME='Egg {}'.format(i), LANGUAGE='US', DEL_YN='N', TETN_SEQ=i, TET_SEQ=i)
+        for i in range(1, egg_instance_count)]
+
+    tables[PgEvent.file_name()] = [
+        row(EVENT_SEQ=i, EVENT_NAME_US='Event {}'.format(i)) for i in range(1, 30)]
+    tables[PgScheduledEvent.file_name()] = [
+        row(SCHEDULE_SEQ=i, OPEN_TIMESTAMP=1500000000 + i * 3600,
+            CLOSE_TIMESTAMP=1500003600 + i * 3600, DUNGEON_SEQ=rnd.randint(1, dungeon_count),
+            EVENT_SEQ=rnd.randint(1, 29), EVENT_TYPE=rnd.randint(0, 3),
+            SERVER=rnd.choice(['US', 'JP']), TEAM_DATA=rnd.randint(0, 2), URL='')
+        for i in range(1, 200 * scale)]
+
+    rotations, dated_rotations = [], []
+    for i in range(1, 40 * scale):
+        rotations.append(row(TSR_SEQ=i, MONSTER_NO=rnd.randint(1, monster_count),
+                             SERVER=rnd.choice(['US', 'JP']), STATUS=0))
+        for rotation_date in ['2017-01-01', '2018-06-01', '2030-01-01']:
+            dated_rotations.append(row(TSRL_SEQ=len(dated_rotations) + 1, TSR_SEQ=i,
+                                       TS_SEQ=rnd.randint(1, skill_count),
+                                       ROTATION_DATE=rotation_date))
+    tables[PgSkillRotation.file_name()] = rotations
+    tables[PgSkillRotationDated.file_name()] = dated_rotations
+
+    for file_name, items in tables.items():
+        with open(os.path.join(data_dir, '{}.json'.format(file_name)), 'w', encoding='utf-8') as f:
+            json.dump({'items': items}, f)
+
+
+def run_benchmark(scale: int, query_rounds: int=3):
+    """Loads a synthetic data set through PgRawDatabase, MonsterIndex and find_monster.
+
+    Fixtures are generated on the first run for each scale. Returns the wall time, peak RSS
+    and net allocated blocks (roughly, objects created and still alive) of each phase.
+    """
+    data_dir = os.path.join(BENCHMARK_DIR, '{}x'.format(scale))
+    if not os.path.exists(os.path.join(data_dir, '{}.json'.format(PgMonster.file_name()))):
+        write_benchmark_fixtures(data_dir, scale)
+
+    phases = []
+
+    def run_phase(name, fn):
+        gc.collect()
+        reset_peak_rss()
+        start_blocks = sys.getallocatedblocks()
+        start_time = time.perf_counter()
+        result = fn()
+        phases.append({
+            'phase': name,
+            'ms': elapsed_ms(start_time),
+            'peak_rss_mb': peak_rss_mb(),
+            'net_allocated_blocks': sys.getallocatedblocks() - start_blocks,
+        })
+        return result
+
+    database = run_phase('database', lambda: PgRawDatabase(data_dir=data_dir))
+    index = run_phase('index', lambda: MonsterIndex(database, {}, {}))
+
+    def run_queries():
+        for _ in range(query_rounds):
+            for query in BENCHMARK_QUERIES:
+                index.find_monster(query)
+    run_phase('find_monster', run_queries)
+
+    query_count = query_rounds * len(BENCHMARK_QUERIES)
+    return {
+        'scale': scale,
+        'monsters': len(database.all_monsters()),
+        'phases': phases,
+        'find_monster_us': int(phases[-1]['ms'] * 1000 / query_count),
+        'database_profile': database.load_profile.to_json(),
+        'index_profile': index.load_profile.to_json(),
+    }
+
+
+def run_benchmarks(scales=BENCHMARK_SCALES):
+    """Runs run_benchmark for every scale, and saves the results to BENCHMARK_RESULTS_PATH."""
+    results = {
+        'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'runs': [run_benchmark(scale) for scale in scales],
+    }
+    with open(BENCHMARK_RESULTS_PATH, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=4)
+    return results
+
+
+def results_to_text(results):
+    msg = '{:<6} {:>8} {:<14} {:>8} {:>8} {:>10}\n'.format(
+        'scale', 'monsters', 'phase', 'ms', 'peak mb', 'allocs')
+    for run in results['runs']:
+        for phase in run['phases']:
+            msg += '{:<6} {:>8} {:<14} {:>8} {:>8} {:>10}\n'.format(
+                '{}x'.format(run['scale']), run['monsters'], phase['phase'], phase['ms'],
+                phase['peak_rss_mb'] or '', phase['net_allocated_blocks'])
+        msg += '{:<6} {:>8} {:<14} {:>8}\n'.format(
+            '', '', 'us per query', run['find_monster_us'])
+    return msg
+
+
+# Monster picked for each historic query by the last saved replay, and the stage which
+# picked it, per index
+REPLAY_BASELINE_PATH = 'data/padguide2/replay_baseline.json'
+
+
+def percentile(sorted_values, pct: int):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = -(-pct * len(sorted_values) // 100)
+    return sorted_values[max(rank, 1) - 1]
+
+
+def replay_lookups(index: MonsterIndex, queries, baseline=None):
+    """Times find_monster on each query, and compares its picks against a saved baseline.
+
+    results maps each query to [monster_no, stage], the monster picked and the stage of
+    the find_monster cascade which picked it. baseline is the results of a previous replay;
+    queries it doesn't have are not compared. The stages come from a second, untimed pass,
+    so the timings cover find_monster alone.
+
+    Each query is timed once, so the percentiles are over distinct queries rather than
+    over lookups weighted by how often users made them.
+    """
+    timings = []
+    results = {}
+    for query in queries:
+        start_time = time.perf_counter()
+        nm, _, _ = index.find_monster(query)
+        timings.append(time.perf_counter() - start_time)
+        results[query] = [nm.monster_no if nm else None]
+
+    stages = defaultdict(int)
+    for query in queries:
+        stage = index.find_monster_stage(query)
+        results[query].append(stage)
+        stages[stage] += 1
+
+    timings.sort()
+    baseline = baseline or {}
+    return {
+        'queries': len(queries),
+        'p50_us': int(percentile(timings, 50) * 1e6) if timings else 0,
+        'p95_us': int(percentile(timings, 95) * 1e6) if timings else 0,
+        'p99_us': int(percentile(timings, 99) * 1e6) if timings else 0,
+        'max_us': int(timings[-1] * 1e6) if timings else 0,
+        'stages': dict(stages),
+        'results': results,
+        'changed': [(q, baseline[q], results[q]) for q in queries
+                    if q in baseline and baseline[q] != results[q]],
+    }
+
+
+def replay_historic_lookups(indexes, queries, save_baseline=False):
+    """Runs replay_lookups for each of a {name: MonsterIndex} dict against the saved baseline.
+
+    If save_baseline is set, the new results replace the baseline in REPLAY_BASELINE_PATH.
+    """
+    saved = {}
+    if os.path.exists(REPLAY_BASELINE_PATH):
+        with open(REPLAY_BASELINE_PATH, encoding='utf-8') as f:
+            saved = json.load(f)
+    replays = {name: replay_lookups(index, queries, saved.get(name))
+               for name, index in indexes.items()}
+    if save_baseline:
+        with open(REPLAY_BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({name: replay['results'] for name, replay in replays.items()}, f, indent=4)
+    return replays
+
+
+def replays_to_text(replays):
+    msg = 'Latencies are over distinct queries, not weighted by how often each was looked up\n\n'
+    msg += '{:<6} {:>8} {:>8} {:>8} {:>8} {:>8} {:>8}\n'.format(
+        'index', 'queries', 'p50 us', 'p95 us', 'p99 us', 'max us', 'changed')
+    for name, replay in sorted(replays.items()):
+        msg += '{:<6} {:>8} {:>8} {:>8} {:>8} {:>8} {:>8}\n'.format(
+            name, replay['queries'], replay['p50_us'], replay['p95_us'],
+            replay['p99_us'], replay['max_us'], len(replay['changed']))
+
+    msg += '\n{:<24} {:>8} {:>8}\n'.format('stage', 'all', 'na')
+    for stage in MATCH_STAGES + ['too_short', 'no_match']:
+        msg += '{:<24} {:>8} {:>8}\n'.format(
+            stage, replays['all']['stages'].get(stage, 0), replays['na']['stages'].get(stage, 0))
+
+    for name, replay in sorted(replays.items()):
+        for query, (old_no, old_stage), (new_no, new_stage) in replay['changed']:
+            msg += '\n{} changed: {} : {} ({}) -> {} ({})'.format(
+                name, query, old_no, old_stage, new_no, new_stage)
+    return msg
+
+
+def scan_prefix_matches(index: MonsterIndex, query: str):
+    """The linear scans which MonsterIndex.prefix_matches replaced, as a benchmark baseline."""
+    matches = set()
+    for nickname, m in index.all_entries.items():
+        if nickname.startswith(query + ' '):
+            matches.add(m)
+    if matches:
+        return 'space_nickname', matches
+
+    for nickname, m in index.all_entries.items():
+        if nickname.startswith(query):
+            matches.add(m)
+    if matches:
+        return 'nickname', matches
+
+    for nickname, m in index.all_entries.items():
+        if m.name_na.lower().startswith(query) or m.name_jp.lower().startswith(query):
+            matches.add(m)
+    if matches:
+        return 'full_name', matches
+    return None, matches
+
+
+def benchmark_prefix_index(index: MonsterIndex, queries):
+    """Times the prefix stages of find_monster against the linear scans they replaced.
+
+    Returns the total time of each, and the queries where the two disagree.
+    """
+    start_time = time.perf_counter()
+    scanned = [scan_prefix_matches(index, q) for q in queries]
+    scan_ms = elapsed_ms(start_time)
+
+    start_time = time.perf_counter()
+    indexed = [index.prefix_matches(q) for q in queries]
+    index_ms = elapsed_ms(start_time)
+
+    return {
+        'queries': len(queries),
+        'scan_ms': scan_ms,
+        'index_ms': index_ms,
+        'mismatches': [q for q, s, i in zip(queries, scanned, indexed) if s != i],
+    }
+
+
+
+# Number of queries in each batch resolved by the batch benchmark
+BATCH_QUERY_COUNT = 1000
+
+
+def benchmark_find_monsters(index: MonsterIndex, queries):
+    """Times find_monsters on a batch of queries against find_monster on each in turn.
+
+    Returns the total time of each, the number of queries resolved by each stage, and the
+    queries where the two picked a different monster or error.
+    """
+    start_time = time.perf_counter()
+    looped = [index.find_monster(q) for q in queries]
+    loop_ms = elapsed_ms(start_time)
+
+    start_time = time.perf_counter()
+    batched, stages = index.find_monsters(queries)
+    batch_ms = elapsed_ms(start_time)
+
+    return {
+        'queries': len(queries),
+        'loop_ms': loop_ms,
+        'batch_ms': batch_ms,
+        'stages': stages,
+        'mismatches': [q for q, (nm, err, _), (batch_nm, batch_err, _, _)
+                       in zip(queries, looped, batched) if (nm, err) != (batch_nm, batch_err)],
+    }
+
+
+def run_synthetic(args):
+    print('Running benchmarks at {}'.format(', '.join('{}x'.format(s) for s in args.scales)))
+    print(results_to_text(run_benchmarks(args.scales)), end='')
+
+
+def run_replay(args):
+    queries = load_historic_queries()
+    if not queries:
+        print('No historic lookups found at ' + HISTORIC_LOOKUPS_PATH)
+        return
+
+    # The same database and indexes the bot serves, from the files it last downloaded
+    database = PgRawDatabase(data_dir=args.data_dir)
+    index = MonsterIndex(database, load_nickname_overrides(), load_basename_overrides())
+    indexes = {
+        'all': index,
+        'na': FilteredMonsterIndex(index, database, lambda m: m.on_na),
+    }
+    replays = replay_historic_lookups(indexes, queries, args.save_baseline)
+    print(replays_to_text(replays))
+    if args.save_baseline:
+        print('Saved as the new baseline')
+
+
+def run_prefix(args):
+    queries = load_historic_queries()
+    if not queries:
+        print('No historic lookups found at ' + HISTORIC_LOOKUPS_PATH)
+        return
+
+    database = PgRawDatabase(data_dir=args.data_dir)
+    index = MonsterIndex(database, load_nickname_overrides(), load_basename_overrides())
+    results = benchmark_prefix_index(index, queries)
+    print('{} queries: linear scans took {}ms, prefix index took {}ms'.format(
+        results['queries'], results['scan_ms'], results['index_ms']))
+    if results['mismatches']:
+        print('{} queries matched differently: {}'.format(
+            len(results['mismatches']), ', '.join(results['mismatches'])))
+
+
+def run_batch(args):
+    queries = load_historic_queries()
+    if not queries:
+        print('No historic lookups found at ' + HISTORIC_LOOKUPS_PATH)
+        return
+
+    database = PgRawDatabase(data_dir=args.data_dir)
+    index = MonsterIndex(database, load_nickname_overrides(), load_basename_overrides())
+
+    # The historic lookups only keep each distinct query once, so the second batch repeats
+    # them the way a listing or a busy channel would
+    rng = random.Random(0)
+    batches = [
+        ('distinct', queries[:BATCH_QUERY_COUNT]),
+        ('with repeats', [rng.choice(queries) for _ in range(BATCH_QUERY_COUNT)]),
+    ]
+    print('{:<14} {:>8} {:>8} {:>9} {:>10}'.format(
+        'batch', 'queries', 'loop ms', 'batch ms', 'mismatches'))
+    all_results = []
+    for name, batch in batches:
+        results = benchmark_find_monsters(index, batch)
+        all_results.append(results)
+        print('{:<14} {:>8} {:>8} {:>9} {:>10}'.format(
+            name, results['queries'], results['loop_ms'], results['batch_ms'],
+            len(results['mismatches'])))
+
+    print('\n{:<24} {:>8}'.format('stage', 'distinct'))
+    for stage in MATCH_STAGES + ['too_short', 'no_match']:
+        print('{:<24} {:>8}'.format(stage, all_results[0]['stages'].get(stage, 0)))
+
+    for (name, _), results in zip(batches, all_results):
+        if results['mismatches']:
+            print('\n{} queries matched differently in the {} batch: {}'.format(
+                len(results['mismatches']), name, ', '.join(results['mismatches'])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks for the PadGuide database and index.')
+    subparsers = parser.add_subparsers()
+
+    synthetic = subparsers.add_parser(
+        'synthetic', help='time loading and searching synthetic databases')
+    synthetic.add_argument('scales', nargs='*', type=int, default=BENCHMARK_SCALES,
+                           help='multiples of the live database size, 1x/5x/20x by default; '
+                                'takes a while and a lot of memory at larger scales')
+    synthetic.set_defaults(run=run_synthetic)
+
+    replay = subparsers.add_parser(
+        'replay', help='replay the historic ^id queries against the full and NA-only indexes')
+    replay.add_argument('--data-dir', help='PadGuide files to load instead of data/padguide2')
+    replay.add_argument('--save-baseline', action='store_true',
+                        help='save the picks as the baseline later replays are compared to')
+    replay.set_defaults(run=run_replay)
+
+    prefix = subparsers.add_parser(
+        'prefix', help='time the nickname prefix index against linear scans, on the historic '
+                       '^id queries')
+    prefix.add_argument('--data-dir', help='PadGuide files to load instead of data/padguide2')
+    prefix.set_defaults(run=run_prefix)
+
+    batch = subparsers.add_parser(
+        'batch', help='time find_monsters against looped find_monster calls, on batches of '
+                      '{} historic ^id queries'.format(BATCH_QUERY_COUNT))
+    batch.add_argument('--data-dir', help='PadGuide files to load instead of data/padguide2')
+    batch.set_defaults(run=run_batch)
+
+    args = parser.parse_args()
+    if not hasattr(args, 'run'):
+        parser.error('choose a benchmark')
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -244,6 +244,10 @@ class PadGlobal:
         msg += "\n (is_low_priority, rarity, monster_no_na) : ({}, {}, {})".format(
             m.is_low_priority, m.rarity, m.monster_no_na)
 
+        msg += "\n\nTop candidates (stage, score):"
+        for c in padinfo_cog.index_all.find_candidates(query):
+            msg += "\n {}. {} : {} {}".format(c.monster.monster_no_na, c.monster.name_na, c.stage, c.score)
+
         sent_messages = []
         for page in pagify(msg):
             sent_messages.append(await self.bot.say(box(page)))
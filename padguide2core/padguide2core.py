@@ -0,0 +1,4350 @@
+"""
+The PadGuide database and monster index, without any Red cog around them.
+
+The PadGuide2 cog loads and refreshes these for the bot, and re-exports everything here,
+so other cogs should keep importing them from padguide2. Keeping them separate lets the
+scripts in benchmarks/ load the same code without running the bot.
+
+Like rpadutils, this has to be installed alongside padguide2, which imports it.
+
+Don't hold on to any of the dastructures exported from here, or the
+entire database could be leaked when the module is reloaded.
+"""
+from _collections import defaultdict
+import array
+import asyncio
+import bisect
+import collections
+import csv
+from datetime import datetime
+import difflib
+import gc
+import hashlib
+import heapq
+from itertools import groupby
+from itertools import islice
+import json
+import mmap
+import operator
+from operator import itemgetter
+import os
+import pickle
+import re
+import socket
+import stat
+import struct
+import sys
+import time
+import traceback
+import types
+import unicodedata
+import weakref
+
+from enum import Enum
+import pytz
+import romkan
+
+from . import rpadutils
+
+
+JSON_FILE_PATTERN = 'data/padguide2/{}.json'
+CSV_FILE_PATTERN = 'data/padguide2/{}.csv'
+
+NICKNAME_FILE_PATTERN = CSV_FILE_PATTERN.format('nicknames')
+BASENAME_FILE_PATTERN = CSV_FILE_PATTERN.format('basenames')
+
+# Queries users have looked up with ^id, recorded by the PadInfo cog
+HISTORIC_LOOKUPS_PATH = 'data/padinfo/historic_lookups.json'
+
+# Other cogs rebuild their data from the database hourly, so a replaced database generation
+# still being alive after this long is a leak
+GENERATION_LEAK_GRACE_SECS = 2 * 60 * 60
+
+# Bump this whenever the PgItem model changes in a way that would make an
+# older pickled database invalid.
+SNAPSHOT_VERSION = 7
+
+# Tables are loaded in tiers, so other cogs can start using the database before it's
+# fully built. Each tier includes the ones before it.
+TIER_MONSTERS = 'monsters'  # monsters, skills, series, types
+TIER_EVOLUTIONS = 'evolutions'  # evolutions, materials, awakenings, monster groups
+TIER_DUNGEONS = 'dungeons'  # dungeons and drops
+TIER_EVENTS = 'events'  # events, schedule, egg machines, skill rotations
+READINESS_TIERS = [TIER_MONSTERS, TIER_EVOLUTIONS, TIER_DUNGEONS, TIER_EVENTS]
+
+# Number of items linked at a time when a tier is linked on the event loop, see _build
+LINK_CHUNK_SIZE = 1000
+
+
+class PgRawDatabase(object):
+    def __init__(self, skip_load=False, data_dir=None, snapshot_path=None, previous=None,
+                 unchanged_tables=None, on_tier_ready=None, run_published=None):
+        """Loads the PadGuide database.
+
+        If snapshot_path is set, the database is restored from the snapshot when none of the
+        source files have changed, and a new snapshot is written after every build.
+
+        If previous is set, the database is refreshed incrementally against it; table groups
+        whose rows have not changed are shared with the previous database instead of being
+        rebuilt. unchanged_tables optionally lists file names that the downloader knows
+        have not changed (e.g. the server returned a 304), so they don't need to be hashed.
+
+        If on_tier_ready is set, it is called from the loading thread with this database and
+        the name of each readiness tier as it completes. The database can be published as
+        soon as the first tier is ready; the later tiers then link through run_published,
+        see _build.
+        """
+        self._skip_load = skip_load
+        self._data_dir = data_dir
+        self.load_profile = LoadProfile()
+        self._all_pg_items = []
+        self._new_pg_items = []
+
+        # file_name -> item map, for every table loaded
+        self._table_maps = {}
+        # file_name -> RowStamps, for every table loaded
+        self._table_stamps = {}
+        # file_name -> sha1 of the source file
+        self.source_hashes = {}
+        # file_name -> (size, mtime) of the source file
+        self._source_stats = {}
+
+        # file_name -> item map reused from the previous database
+        self._reused_maps = {}
+
+        if skip_load:
+            self._build()
+            return
+
+        profile = self.load_profile
+        profile.begin_phase('hash_sources')
+        self.source_hashes, self._source_stats = self._compute_source_hashes(
+            previous, unchanged_tables or ())
+        if previous is not None and not previous._skip_load:
+            profile.begin_phase('plan_incremental')
+            self._plan_incremental(previous)
+        elif snapshot_path:
+            profile.begin_phase('restore_snapshot')
+            if self._restore_snapshot(snapshot_path, self.source_hashes):
+                profile.end_phase()
+                profile.counts['items'] = len(self._all_pg_items)
+                print('Loaded PadGuide2 database from snapshot')
+                if on_tier_ready:
+                    for tier in READINESS_TIERS:
+                        on_tier_ready(self, tier)
+                return
+
+        self._build(previous, on_tier_ready, run_published)
+
+        rebuilt = len(self._new_pg_items) > 0
+        profile.counts['items'] = len(self._all_pg_items)
+        profile.counts['rebuilt_items'] = len(self._new_pg_items)
+        profile.counts['monster_groups'] = len(self.grouped_monsters)
+        self._new_pg_items = []
+        if snapshot_path and rebuilt:
+            profile.begin_phase('write_snapshot')
+            self._write_snapshot(snapshot_path, self.source_hashes)
+        profile.end_phase()
+
+    def _build(self, previous=None, on_tier_ready=None, run_published=None):
+        """Loads, links and finalizes every table, one readiness tier at a time.
+
+        If on_tier_ready is set, it is called with each tier name as soon as the tables in
+        that tier (and the tiers before it) are usable, while the later tiers still load.
+        Linking a tier modifies items from the earlier tiers, so once a tier has been
+        announced, the linking and finalizing of each later tier is passed to
+        run_published(tier, steps) (if set) as a generator. Each step links up to
+        LINK_CHUNK_SIZE items; run_published has to run the steps wherever the published
+        database is read (e.g. on the event loop), and wait for them. It can let readers in
+        between steps, which only ever see whole items linked. Only the parsing happens on
+        the loading thread.
+        """
+        core_reused = PgMonster.file_name() in self._reused_maps
+        self._linked_item_count = 0
+        self._published = False
+
+        # Tables in tiers which haven't loaded yet are empty, so a database which is
+        # published early can still be queried.
+        self._awakening_map = {}
+        self._evolution_map = {}
+        self._evolution_material_map = {}
+        self._dungeon_map = {}
+        self._dungeon_monster_map = {}
+        self._dungeon_monster_drop_map = {}
+        self._event_map = {}
+        self._scheduled_event_map = {}
+        self._skill_rotation_map = {}
+        self._skill_rotation_dated_map = {}
+        self._egg_instance_map = {}
+        self._egg_monster_map = {}
+        self._egg_name_map = {}
+        self.grouped_monsters = []
+        self.skill_rotations = SkillRotationIndex([])
+
+        # Monsters and skills
+        def finish_monsters():
+            if core_reused:
+                self.monster_no_na_to_monster_no = previous.monster_no_na_to_monster_no
+            else:
+                # Used to normalize from monster NA values back to monster number
+                self.monster_no_na_to_monster_no = {
+                    m.monster_no_na: m.monster_no for m in self._monster_map.values()}
+
+        self._build_tier(TIER_MONSTERS, [
+            ('_attribute_map', PgAttribute),
+            ('_type_map', PgType),
+            ('_series_map', PgSeries),
+            ('_skill_map', PgSkill),
+            ('_skill_leader_data_map', PgSkillLeaderData),
+            ('_monster_map', PgMonster),
+            ('_monster_add_info_map', PgMonsterAddInfo),
+            ('_monster_info_map', PgMonsterInfo),
+            ('_monster_price_map', PgMonsterPrice),
+        ], finish_monsters, on_tier_ready, run_published)
+
+        # Evolutions and awakenings
+        def finish_evolutions():
+            if core_reused:
+                self.grouped_monsters = previous.grouped_monsters
+                return
+
+            for monsters in in_chunks(self._monster_map.values()):
+                for m in monsters:
+                    m.finalize_evolutions()
+                yield
+
+            # Stick the monsters into groups so that we can calculate info across
+            # the entire group
+            grouped_monsters = list()
+            for monsters in in_chunks(self._monster_map.values()):
+                for m in monsters:
+                    if m.cur_evo_type != EvoType.Base:
+                        continue
+                    grouped_monsters.append(MonsterGroup(m))
+                yield
+            self.grouped_monsters = grouped_monsters
+
+        self._build_tier(TIER_EVOLUTIONS, [
+            ('_awakening_map', PgAwakening),
+            ('_evolution_map', PgEvolution),
+            ('_evolution_material_map', PgEvolutionMaterial),
+        ], finish_evolutions, on_tier_ready, run_published)
+
+        # Dungeons and drops
+        def finish_dungeons():
+            if core_reused:
+                return
+            for monsters in in_chunks(self._monster_map.values()):
+                for m in monsters:
+                    m.finalize_drops()
+                yield
+            # Recompute the tree acquisition status now that farmable is known
+            for groups in in_chunks(self.grouped_monsters):
+                for mg in groups:
+                    mg._initialize_members()
+                yield
+
+        self._build_tier(TIER_DUNGEONS, [
+            ('_dungeon_map', PgDungeon),
+            # ('_dungeon_damage_map', PgDungeonDamage),
+            ('_dungeon_monster_map', PgDungeonMonster),
+            ('_dungeon_monster_drop_map', PgDungeonMonsterDrop),
+            # ('_dungeon_skill_map', PgDungeonSkill),
+            # ('_dungeon_type_map', PgDungeonType),
+            # ('_sub_dungeon_map', PgSubDungeon),
+        ], finish_dungeons, on_tier_ready, run_published)
+
+        # Events, egg machines and skill rotations
+        def finish_events():
+            if core_reused:
+                self.skill_rotations = previous.skill_rotations
+            else:
+                self.skill_rotations = SkillRotationIndex(self._skill_rotation_dated_map.values())
+
+            self._reused_maps = {}
+
+            # Nothing modifies the items after the last tier
+            self.load_profile.begin_phase('share_empty_containers')
+            for items in in_chunks(self._new_pg_items):
+                for i in items:
+                    i.share_empty_containers()
+                yield
+
+        self._build_tier(TIER_EVENTS, [
+            ('_event_map', PgEvent),
+            ('_scheduled_event_map', PgScheduledEvent),
+            ('_egg_instance_map', PgEggInstance),
+            ('_egg_monster_map', PgEggMonster),
+            ('_egg_name_map', PgEggName),
+            ('_skill_rotation_map', PgSkillRotation),
+            ('_skill_rotation_dated_map', PgSkillRotationDated),
+        ], finish_events, on_tier_ready, run_published)
+
+    def _build_tier(self, tier: str, tables, finish, on_tier_ready, run_published):
+        """Loads the (map attribute, itemtype) tables of a tier, then links and finalizes them.
+
+        The maps are set when linking starts, since the items look each other up through
+        them. Nothing should read a tier's tables before it's announced.
+
+        finish runs after the items are linked. It can be a generator, yielding after each
+        chunk of its work.
+        """
+        self.load_profile.begin_phase(tier + '_load')
+        maps = [self._load(itemtype) for _, itemtype in tables]
+
+        def link():
+            for (name, _), result_map in zip(tables, maps):
+                setattr(self, name, result_map)
+            yield from self._link_new_items(tier)
+            # finish returns None if it has nothing to split up
+            yield from finish() or ()
+            self._tier_ready(tier, on_tier_ready)
+
+        if self._published and run_published:
+            run_published(tier, link())
+        else:
+            for _ in link():
+                pass
+
+    def _link_new_items(self, tier: str):
+        """Links and finalizes the items loaded since the last call.
+
+        This is a generator, which yields after every LINK_CHUNK_SIZE items.
+        """
+        profile = self.load_profile
+        new_items = self._new_pg_items[self._linked_item_count:]
+        self._linked_item_count = len(self._new_pg_items)
+
+        # Ensure that every item has loaded its dependencies. Items shared with a previous
+        # database are already linked. Dependencies are loaded on demand, so the time for a
+        # table includes loading any items it links to which weren't loaded yet.
+        profile.begin_phase(tier + '_link')
+        for itemtype, items in groupby(new_items, key=type):
+            link_secs = 0
+            for chunk in in_chunks(items):
+                start_time = time.perf_counter()
+                for i in chunk:
+                    self._ensure_loaded(i)
+                link_secs += time.perf_counter() - start_time
+                yield
+            profile.add_table_stat(itemtype.file_name(), 'link_ms', int(link_secs * 1000))
+
+        # Finish loading now that all the dependencies are resolved
+        profile.begin_phase(tier + '_finalize')
+        for itemtype, items in groupby(new_items, key=type):
+            finalize_secs = 0
+            for chunk in in_chunks(items):
+                start_time = time.perf_counter()
+                for i in chunk:
+                    i.finalize()
+                finalize_secs += time.perf_counter() - start_time
+                yield
+            profile.add_table_stat(itemtype.file_name(), 'finalize_ms', int(finalize_secs * 1000))
+
+    def _tier_ready(self, tier: str, on_tier_ready):
+        self.load_profile.end_phase()
+        if on_tier_ready and not self._skip_load:
+            on_tier_ready(self, tier)
+            self._published = True
+
+    def _file_path(self, itemtype):
+        if self._data_dir:
+            return os.path.join(self._data_dir, '{}.json'.format(itemtype.file_name()))
+        else:
+            return JSON_FILE_PATTERN.format(itemtype.file_name())
+
+    def _compute_source_hashes(self, previous=None, unchanged_tables=()):
+        """Computes file_name -> sha1 and file_name -> (size, mtime) maps for the source files.
+
+        Files listed in unchanged_tables reuse the hash from the previous database, as long
+        as the file on disk is still the one the previous database was loaded from.
+        """
+        source_hashes = {}
+        source_stats = {}
+        for itemtype in DATABASE_ITEM_TYPES:
+            file_name = itemtype.file_name()
+            file_path = self._file_path(itemtype)
+            if not os.path.exists(file_path):
+                source_hashes[file_name] = None
+                continue
+
+            file_stat = os.stat(file_path)
+            source_stats[file_name] = (file_stat.st_size, file_stat.st_mtime)
+            if (previous is not None and file_name in unchanged_tables and
+                    previous._source_stats.get(file_name) == source_stats[file_name]):
+                source_hashes[file_name] = previous.source_hashes.get(file_name)
+                continue
+
+            sha1 = hashlib.sha1()
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha1.update(chunk)
+            source_hashes[file_name] = sha1.hexdigest()
+        return source_hashes, source_stats
+
+    def _restore_snapshot(self, snapshot_path, source_hashes):
+        """Replaces the contents of this database with the snapshot, if it is still valid."""
+        if not os.path.exists(snapshot_path):
+            return False
+
+        # Allocating hundreds of thousands of container objects repeatedly triggers the
+        # cyclic GC, which costs more than the unpickling itself.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(snapshot_path, 'rb') as f:
+                header = pickle.load(f)
+                if header.get('version') != SNAPSHOT_VERSION:
+                    print('PadGuide2 snapshot version mismatch, rebuilding')
+                    return False
+                if header.get('source_hashes') != source_hashes:
+                    print('PadGuide2 source files changed, rebuilding')
+                    return False
+
+                # Allocate every item up front so that references between items can be
+                # resolved by position while the states are unpickled.
+                items = []
+                for file_name, count in header['item_counts']:
+                    itemtype = ITEM_TYPE_BY_FILE_NAME[file_name]
+                    items.extend(itemtype.__new__(itemtype) for _ in range(count))
+
+                unpickler = pickle.Unpickler(f)
+                unpickler.persistent_load = items.__getitem__
+                table_states, database_state = unpickler.load()
+
+            start = 0
+            for (file_name, count), columns in zip(header['item_counts'], table_states):
+                itemtype = ITEM_TYPE_BY_FILE_NAME[file_name]
+                table_items = items[start:start + count]
+                start += count
+                for name, column in zip(_slot_names(itemtype), columns):
+                    # Equivalent to setattr(item, name, value) for every item, but the
+                    # loop runs in C
+                    collections.deque(map(getattr(itemtype, name).__set__, table_items, column),
+                                      maxlen=0)
+        except Exception as ex:
+            print('Failed to read PadGuide2 snapshot', ex)
+            return False
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        data_dir = self._data_dir
+        load_profile = self.load_profile
+        self.__dict__.update(database_state)
+        self._data_dir = data_dir
+        self.load_profile = load_profile
+        return True
+
+    def _write_snapshot(self, snapshot_path, source_hashes):
+        """Pickles the fully linked database so the next startup can skip the JSON load.
+
+        The item graph is too deeply linked to pickle directly, so every table is written
+        as one list of values per slot, and references to other PgItems are replaced by
+        their position in _all_pg_items.
+        """
+        item_counts = []
+        table_states = []
+        for itemtype, group in groupby(self._all_pg_items, key=type):
+            table_items = list(group)
+            item_counts.append((itemtype.file_name(), len(table_items)))
+            table_states.append([[getattr(item, name, None) for item in table_items]
+                                 for name in _slot_names(itemtype)])
+        item_positions = {id(item): idx for idx, item in enumerate(self._all_pg_items)}
+
+        header = {
+            'version': SNAPSHOT_VERSION,
+            'source_hashes': source_hashes,
+            'item_counts': item_counts,
+        }
+
+        tmp_path = snapshot_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+                pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+                pickler.persistent_id = lambda obj: item_positions.get(id(obj))
+                pickler.dump((table_states, self.__dict__))
+            os.replace(tmp_path, snapshot_path)
+        except Exception as ex:
+            print('Failed to write PadGuide2 snapshot', ex)
+            traceback.print_exc()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _plan_incremental(self, previous: 'PgRawDatabase'):
+        """Decides which table groups can be shared with the previous database.
+
+        A table is unchanged only if its source file has the same hash. The core group is
+        linked into by every other group, so if any core table changed, everything is
+        rebuilt. Changes which only modify rows are patched in place instead (see
+        plan_row_patch), so this is for rows being added, removed or relinked.
+        """
+        changed_tables = [itemtype.file_name() for itemtype in DATABASE_ITEM_TYPES
+                          if self.source_hashes[itemtype.file_name()] !=
+                          previous.source_hashes.get(itemtype.file_name())]
+
+        reused_groups = []
+        for group_name, itemtypes in DATABASE_ITEM_GROUPS:
+            if any(t.file_name() in changed_tables for t in itemtypes):
+                if group_name == CORE_ITEM_GROUP:
+                    break
+                continue
+            reused_groups.append(group_name)
+            for itemtype in itemtypes:
+                file_name = itemtype.file_name()
+                self._reused_maps[file_name] = previous._table_maps[file_name]
+                self._table_stamps[file_name] = previous._table_stamps[file_name]
+
+        print('PadGuide2 incremental refresh: changed tables={} reused groups={}'.format(
+            changed_tables, reused_groups))
+
+    def plan_row_patch(self, unchanged_tables=()):
+        """Finds the rows which changed in the source files since this database was loaded.
+
+        Returns a RowPatch for apply_row_patch if every changed row can be updated in place,
+        or None if the database has to be rebuilt instead: rows were added or removed, a row
+        changed what it links to, or a file changed without any of its TSTAMPs changing.
+        Only the changed files are parsed.
+
+        Only reads this database, so it can run on a worker thread while it's published.
+        """
+        if self._skip_load:
+            return None
+
+        profile = LoadProfile()
+        profile.begin_phase('hash_sources')
+        source_hashes, source_stats = self._compute_source_hashes(self, unchanged_tables)
+        patch = RowPatch(source_hashes, source_stats, profile)
+
+        profile.begin_phase('plan_row_patch')
+        for itemtype in DATABASE_ITEM_TYPES:
+            file_name = itemtype.file_name()
+            if source_hashes[file_name] == self.source_hashes.get(file_name):
+                continue
+
+            reason = self._plan_table_patch(itemtype, patch)
+            if reason:
+                print('PadGuide2 row patch not possible, {} {}'.format(file_name, reason))
+                return None
+
+        profile.end_phase()
+        profile.counts['patched_rows'] = len(patch.updates)
+        print('PadGuide2 row patch: changed rows={}'.format(
+            {file_name: stats['patched'] for file_name, stats in profile.tables.items()}))
+        return patch
+
+    def _plan_table_patch(self, itemtype, patch: 'RowPatch'):
+        """Adds the changed rows of a table to patch. Returns why it can't, if it can't."""
+        file_name = itemtype.file_name()
+        previous_stamps = self._table_stamps.get(file_name)
+        if itemtype._patch_fields is None or previous_stamps is None:
+            return 'is not patchable'
+        if patch.source_hashes[file_name] is None:
+            return 'was removed'
+
+        items = {}
+        stamps = {}
+        try:
+            for row in self._iter_rows(itemtype):
+                item = itemtype(row)
+                if not item.deleted():
+                    items[item.key()] = item
+                    stamps[item.key()] = _row_tstamp(row)
+        except ValueError as ex:
+            return 'failed to parse: {}'.format(ex)
+
+        previous_stamps = previous_stamps.to_dict()
+        if stamps.keys() != previous_stamps.keys():
+            return 'added or removed rows'
+        changed_keys = [key for key, tstamp in stamps.items() if tstamp != previous_stamps[key]]
+        if not changed_keys:
+            # The TSTAMPs can't be trusted to say what changed
+            return 'changed without any TSTAMP changing'
+
+        current_items = self._table_maps[file_name]
+        for key in changed_keys:
+            item = current_items[key]
+            new_item = items[key]
+            for name in itemtype._link_fields:
+                if getattr(item, name) != getattr(new_item, name):
+                    return 'changed {} of {}'.format(name, key)
+            patch.updates.append((item, new_item))
+        patch.table_stamps[file_name] = RowStamps(stamps)
+        patch.load_profile.add_table_stat(file_name, 'rows', len(stamps))
+        patch.load_profile.add_table_stat(file_name, 'patched', len(changed_keys))
+        return None
+
+    def apply_row_patch(self, patch: 'RowPatch'):
+        """Updates the changed rows from plan_row_patch in place.
+
+        Only does work proportional to the changed rows, so it can run on the event loop,
+        where nothing can observe a half-patched database.
+        """
+        profile = patch.load_profile
+        profile.begin_phase('apply_row_patch')
+        monsters = collections.OrderedDict()
+        for item, new_item in patch.updates:
+            for name in item._patch_fields:
+                setattr(item, name, getattr(new_item, name))
+            for m in item.patched_monsters(self):
+                monsters[m.monster_no] = m
+        self._refresh_monsters(monsters.values())
+
+        self.source_hashes = patch.source_hashes
+        self._source_stats = patch.source_stats
+        self._table_stamps.update(patch.table_stamps)
+        profile.end_phase()
+        profile.counts['items'] = len(self._all_pg_items)
+        profile.counts['refreshed_monsters'] = len(monsters)
+        self.load_profile = profile
+
+    def _refresh_monsters(self, monsters):
+        """Recomputes the values derived from other rows for monsters which were patched."""
+        if not monsters:
+            return
+        groups_by_base = {mg.base_monster.monster_no: mg for mg in self.grouped_monsters}
+        groups = collections.OrderedDict()
+        for m in monsters:
+            m.load_details(self)
+            m.finalize()
+            m.finalize_evolutions()
+            group = groups_by_base.get(m.base_monster.monster_no)
+            if group:
+                groups[group.base_monster.monster_no] = group
+        for mg in groups.values():
+            mg._initialize_members()
+
+    def _iter_rows(self, itemtype):
+        file_path = self._file_path(itemtype)
+        if not os.path.exists(file_path):
+            return iter(())
+        return iter_json_items(file_path)
+
+    def _load(self, itemtype):
+        if self._skip_load:
+            return {}
+
+        file_name = itemtype.file_name()
+        if file_name in self._reused_maps:
+            result_map = self._reused_maps[file_name]
+            self._table_maps[file_name] = result_map
+            self._all_pg_items.extend(result_map.values())
+            self.load_profile.add_table_stat(file_name, 'items', len(result_map))
+            self.load_profile.add_table_stat(file_name, 'reused', 1)
+            return result_map
+
+        # Rows are streamed out of the file and turned into items one at a time, so the
+        # raw dicts for a whole table are never held in memory at once.
+        row_count = 0
+        stamps = {}
+        result_map = {}
+        parse_time = 0
+        construct_time = 0
+        try:
+            rows_start = time.perf_counter()
+            for row in self._iter_rows(itemtype):
+                item_start = time.perf_counter()
+                parse_time += item_start - rows_start
+
+                row_count += 1
+                item = itemtype(row)
+                if not item.deleted():
+                    result_map[item.key()] = item
+                    stamps[item.key()] = _row_tstamp(row)
+
+                rows_start = time.perf_counter()
+                construct_time += rows_start - item_start
+        except ValueError as ex:
+            print('Failed to parse', file_name, ex)
+            row_count = 0
+            stamps = {}
+            result_map = {}
+
+        self.load_profile.add_table_stat(file_name, 'rows', row_count)
+        self.load_profile.add_table_stat(file_name, 'items', len(result_map))
+        self.load_profile.add_table_stat(file_name, 'parse_ms', parse_time * 1000)
+        self.load_profile.add_table_stat(file_name, 'construct_ms', construct_time * 1000)
+
+        self._table_stamps[file_name] = RowStamps(stamps)
+
+        self._table_maps[file_name] = result_map
+        self._all_pg_items.extend(result_map.values())
+        self._new_pg_items.extend(result_map.values())
+
+        return result_map
+
+    def _ensure_loaded(self, item: 'PgItem'):
+        if item:
+            item.ensure_loaded(self)
+        return item
+
+    def normalize_monster_no_na(self, monster_no_na: int):
+        if monster_no_na > 10000:
+            # Allows crows to be referenced
+            return monster_no_na - 10000
+        return self.monster_no_na_to_monster_no[monster_no_na]
+
+    def all_monsters(self):
+        """Exported for access to the full monster list."""
+        return list(self._monster_map.values())
+
+    def all_dungeons(self):
+        """Exported for access to the full dungeon list."""
+        return list(self._dungeon_map.values())
+
+    def all_egg_instances(self):
+        """Exported for access to the full egg machine list."""
+        return list(self._egg_instance_map.values())
+
+    def all_scheduled_events(self):
+        """Exported for access to event list."""
+        se = list(self._scheduled_event_map.values())
+        return se
+
+    def rotating_skillups(self, server: str):
+        """Gets monsters used as rotating skillups for the specified server"""
+        self.skill_rotations.advance()
+        return self.skill_rotations.active_monsters(server)
+
+    def getAttributeEnum(self, ta_seq: int):
+        attr = self._ensure_loaded(self._attribute_map.get(ta_seq))
+        return attr.value if attr else None
+
+    def getAwakening(self, tma_seq: int):
+        return self._ensure_loaded(self._awakening_map.get(tma_seq))
+
+    def getDungeon(self, dungeon_seq: int):
+        return self._ensure_loaded(self._dungeon_map.get(dungeon_seq))
+
+#    def getDungeonDamage(self, tds_seq: int):
+#        return self._ensure_loaded(self._dungeon_damage_map.get(tds_seq))
+
+    def getDungeonMonsterDrop(self, tdmd_seq: int):
+        return self._ensure_loaded(self._dungeon_monster_drop_map.get(tdmd_seq))
+
+    def getDungeonMonster(self, tdm_seq: int):
+        return self._ensure_loaded(self._dungeon_monster_map.get(tdm_seq))
+
+#    def getDungeonType(self, tdt_seq: int):
+#        return self._ensure_loaded(self._dungeon_type_map.get(tdt_seq))
+
+    def getEvent(self, event_seq: int):
+        return self._ensure_loaded(self._event_map.get(event_seq))
+
+    def getEvolution(self, tv_seq: int):
+        return self._ensure_loaded(self._evolution_map.get(tv_seq))
+
+    def getEvolutionMaterial(self, tem_seq: int):
+        return self._ensure_loaded(self._evolution_material_map.get(tem_seq))
+
+    def getMonster(self, monster_no: int):
+        return self._ensure_loaded(self._monster_map.get(monster_no))
+
+    def getMonsterAddInfo(self, monster_no: int):
+        return self._ensure_loaded(self._monster_add_info_map.get(monster_no))
+
+    def getMonsterInfo(self, monster_no: int):
+        return self._ensure_loaded(self._monster_info_map.get(monster_no))
+
+    def getMonsterPrice(self, monster_no: int):
+        return self._ensure_loaded(self._monster_price_map.get(monster_no))
+
+    def getSeries(self, tsr_seq: int):
+        return self._ensure_loaded(self._series_map.get(tsr_seq))
+
+    def getScheduledEvent(self, schedule_seq: int):
+        return self._ensure_loaded(self._scheduled_event_map.get(schedule_seq))
+
+    def getSkill(self, ts_seq: int):
+        return self._ensure_loaded(self._skill_map.get(ts_seq))
+
+    def getSkillLeaderData(self, ts_seq: int):
+        skill_leader = self._skill_leader_data_map.get(ts_seq)
+        if skill_leader:
+            return self._ensure_loaded(skill_leader)
+        else:
+            return PgSkillLeaderData.empty()
+
+    def getSkillRotation(self, tsr_seq: int):
+        return self._ensure_loaded(self._skill_rotation_map.get(tsr_seq))
+
+    def getSkillRotationDated(self, tsrl_seq: int):
+        return self._ensure_loaded(self._skill_rotation_dated_map.get(tsrl_seq))
+
+#    def getSubDungeon(self, tsd_seq: int):
+#        return self._ensure_loaded(self._sub_dungeon_map.get(tsd_seq))
+
+    def getTypeName(self, tt_seq: int):
+        type = self._ensure_loaded(self._type_map.get(tt_seq))
+        return type.name if type else None
+
+    def getEggInstance(self, tet_seq: int):
+        return self._ensure_loaded(self._egg_instance_map.get(tet_seq))
+
+    def getEggMonster(self, tem_seq: int):
+        return self._ensure_loaded(self._egg_monster_map.get(tem_seq))
+
+    def getEggName(self, tetn_seq: int):
+        return self._ensure_loaded(self._egg_name_map.get(tetn_seq))
+
+    def memory_usage(self):
+        """Computes a (file_name, item count, bytes) entry for every table.
+
+        An item's bytes include everything it owns, except other PgItems. Objects shared
+        between items (interned strings, shared empty containers) are only counted once.
+        """
+        seen = set()
+        results = []
+        for itemtype in DATABASE_ITEM_TYPES:
+            items = self._table_maps.get(itemtype.file_name(), {}).values()
+            size = sum(_deep_sizeof(item, seen) for item in items)
+            results.append((itemtype.file_name(), len(items), size))
+        return results
+
+
+class PgItem(object):
+    """Base class for all items loaded from PadGuide.
+
+    You must call super().__init__() in your constructor.
+    You must override key() and load().
+    You must list every attribute you set in __slots__.
+    """
+
+    __slots__ = ('_loaded', '_loading_error')
+
+    # List and dict attributes which are empty for most items. After the database is built,
+    # the empty ones are replaced by a single shared (immutable) instance.
+    _sparse_containers = ()
+
+    # Attributes read from the row which can be copied over in place when the row changes.
+    # None if a changed row always needs a rebuild.
+    _patch_fields = None
+    # Attributes read from the row which load() links by. Every other attribute read from the
+    # row has to be listed in _patch_fields.
+    _link_fields = ()
+
+    def __init__(self):
+        self._loaded = False
+
+    def key(self):
+        """Used to look up an item by id."""
+        raise NotImplementedError()
+
+    def deleted(self):
+        """Is this item marked for deletion. Discard if true. Not all items can be deleted."""
+        return False
+
+    def ensure_loaded(self, database: PgRawDatabase):
+        """Ensures that the dependencies have been loaded, or loads them."""
+        if not self._loaded:
+            self._loaded = True
+            self._loading_error = False
+            try:
+                self.load(database)
+            except Exception as ex:
+                self._loading_error = False
+                print('Error occurred while loading item')
+                print(type(self), 'key=', self.key())
+                traceback.print_exc()
+
+        return self
+
+    def load(self, database: PgRawDatabase):
+        """Override to inject dependencies."""
+        raise NotImplementedError()
+
+    def finalize(self):
+        """Finish filling in anything that requires completion but no dependencies."""
+        pass
+
+    def patched_monsters(self, database: PgRawDatabase):
+        """Monsters with values computed from this item, which need updating when it's patched."""
+        return ()
+
+    def share_empty_containers(self):
+        for name in self._sparse_containers:
+            value = getattr(self, name)
+            if not value:
+                setattr(self, name, EMPTY_LIST if isinstance(value, list) else EMPTY_DICT)
+
+
+class _SharedEmptyList(list):
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('The shared empty list cannot be modified')
+
+    append = extend = insert = remove = pop = clear = _immutable
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+
+
+class _SharedEmptyDict(dict):
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('The shared empty dict cannot be modified')
+
+    setdefault = update = pop = popitem = clear = _immutable
+    __setitem__ = __delitem__ = _immutable
+
+
+EMPTY_LIST = _SharedEmptyList()
+EMPTY_DICT = _SharedEmptyDict()
+
+
+class Attribute(Enum):
+    """Standard 5 PAD colors in enum form. Values correspond to PadGuide values."""
+    Fire = 1
+    Water = 2
+    Wood = 3
+    Light = 4
+    Dark = 5
+
+
+# attributeList
+# {
+#     "ORDER_IDX": "2",
+#     "TA_NAME_JP": "\u6c34",
+#     "TA_NAME_KR": "\ubb3c",
+#     "TA_NAME_US": "Water",
+#     "TA_SEQ": "2",
+#     "TSTAMP": "1372947975226"
+# },
+class PgAttribute(PgItem):
+    __slots__ = ('ta_seq', 'name', 'value')
+
+    @staticmethod
+    def file_name():
+        return 'attributeList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.ta_seq = int(item['TA_SEQ'])  # unique id
+        self.name = item['TA_NAME_US']
+
+        self.value = Attribute(self.ta_seq)
+
+    def key(self):
+        return self.ta_seq
+
+    def load(self, database: PgRawDatabase):
+        pass
+
+
+# awokenSkillList
+# {
+#     "DEL_YN": "N",
+#     "IS_SUPER": "1",
+#     "MONSTER_NO": "661",
+#     "ORDER_IDX": "1",
+#     "TMA_SEQ": "1",
+#     "TSTAMP": "1380587210665",
+#     "TS_SEQ": "2769"
+# },
+class PgAwakening(PgItem):
+    __slots__ = ('tma_seq', 'ts_seq', 'deleted_yn', 'monster_no', 'order', 'is_super', 'skill',
+                 'monster')
+    _patch_fields = ('deleted_yn', 'order', 'is_super')
+    _link_fields = ('tma_seq', 'ts_seq', 'monster_no')
+
+    @staticmethod
+    def file_name():
+        return 'awokenSkillList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.tma_seq = int(item['TMA_SEQ'])  # unique id
+        self.ts_seq = int(item['TS_SEQ'])  # PgSkill id - awakening info
+        self.deleted_yn = item['DEL_YN']  # Either Y(discard) or N.
+        self.monster_no = int(item['MONSTER_NO'])  # PgMonster id - monster this belongs to
+        self.order = int(item['ORDER_IDX'])  # display order
+        self.is_super = item.get('IS_SUPER', '0') == '1'
+
+        self.skill = None  # type: PgSkill  # The awakening skill
+        self.monster = None  # type: PgMonster # The monster the awakening belongs to
+
+    def key(self):
+        return self.tma_seq
+
+    def deleted(self):
+        return self.deleted_yn == 'Y'
+
+    def load(self, database: PgRawDatabase):
+        self.skill = database.getSkill(self.ts_seq)
+        self.monster = database.getMonster(self.monster_no)
+
+        self.monster.awakenings.append(self)
+        self.skill.monsters_with_awakening.append(self.monster)
+
+    def patched_monsters(self, database: PgRawDatabase):
+        return [self.monster]
+
+    def get_name(self):
+        return self.skill.name
+
+
+# dungeonList
+# {
+#     "APP_VERSION": "",
+#     "COMMENT_JP": "",
+#     "COMMENT_KR": "",
+#     "COMMENT_US": "",
+#     "DUNGEON_SEQ": "102",
+#     "DUNGEON_TYPE": "1",
+#     "ICON_SEQ": "666",
+#     "NAME_JP": "ECO\u30b3\u30e9\u30dc",
+#     "NAME_KR": "ECO \ucf5c\ub77c\ubcf4",
+#     "NAME_US": "ECO Collab",
+#     "ORDER_IDX": "3",
+#     "SHOW_YN": "1",
+#     "TDT_SEQ": "10",
+#     "TSTAMP": "1373289123410"
+# },
+class PgDungeon(PgItem):
+    __slots__ = ('dungeon_seq', 'dungeon_type', 'dungeon_type_value', 'name', 'name_jp', 'tdt_seq',
+                 'show', 'icon', 'tdungeon_type', 'tdungeon_type_name', 'monsters',
+                 'subdungeons')
+    _sparse_containers = ('monsters', 'subdungeons')
+    _patch_fields = ('dungeon_type', 'dungeon_type_value', 'name', 'name_jp', 'tdt_seq', 'show',
+                     'icon')
+    _link_fields = ('dungeon_seq',)
+
+    @staticmethod
+    def file_name():
+        return 'dungeonList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.dungeon_seq = int(item['DUNGEON_SEQ'])
+        self.dungeon_type = int(item['DUNGEON_TYPE'])
+        # TODO: merge these two, delete DungeonType from padevents
+        self.dungeon_type_value = DungeonType(self.dungeon_type)
+        self.name = item['NAME_US']
+        self.name_jp = item['NAME_JP']
+        # TODO: load tdt type
+        self.tdt_seq = int_or_none(item['TDT_SEQ'])
+        self.show = item['SHOW_YN'] == 1
+        self.icon = int(item['ICON_SEQ'])
+
+        self.tdungeon_type = None
+        self.tdungeon_type_name = 'no_type'
+
+        self.monsters = []
+        self.subdungeons = []
+
+    def key(self):
+        return self.dungeon_seq
+
+    def deleted(self):
+        return False
+#         return not self.show
+
+    def load(self, database: PgRawDatabase):
+        pass
+#        if self.tdt_seq:
+#            self.tdungeon_type = database.getDungeonType(self.tdt_seq)
+#            # Somehow this can still fail
+#            if self.tdungeon_type:
+#                self.tdungeon_type_name = self.tdungeon_type.name
+
+
+class DungeonType(Enum):
+    Unknown = -1
+    Normal = 0
+    CoinDailyOther = 1
+    Technical = 2
+    Etc = 3
+
+
+# {
+#     "COIN_MAX": "2496",
+#     "COIN_MIN": "2496",
+#     "DUNGEON_SEQ": "81",
+#     "EXP_MAX": "2420",
+#     "EXP_MIN": "2420",
+#     "ORDER_IDX": "96",
+#     "STAGE": "5",
+#     "STAMINA": "15",
+#     "TSD_NAME_JP": "\u65ad\u7f6a\u306e\u7114 \u4e2d\u7d1a",
+#     "TSD_NAME_KR": "\ub2e8\uc8c4\uc758 \ubd88\uaf43 \uc911\uae09",
+#     "TSD_NAME_US": "Flame of Conviction - Int",
+#     "TSD_SEQ": "1365",
+#     "TSTAMP": "1373446281337"
+# },
+class PgSubDungeon(PgItem):
+    __slots__ = ('dungeon_seq', 'exp_max', 'exp_min', 'order', 'stage', 'stamina', 'name',
+                 'tsd_seq', 'monsters', 'floor_to_monsters', 'dungeon')
+
+    @staticmethod
+    def file_name():
+        return 'subDungeonList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.dungeon_seq = int(item['DUNGEON_SEQ'])
+        self.exp_max = int(item['EXP_MAX'])
+        self.exp_min = int(item['EXP_MIN'])
+        self.order = int(item['ORDER_IDX'])
+        self.stage = int(item['STAGE'])
+        self.stamina = int(item['STAMINA'])
+        self.name = item['TSD_NAME_US']
+        self.tsd_seq = int(item['TSD_SEQ'])
+
+        self.monsters = []
+        self.floor_to_monsters = defaultdict(list)
+
+    def key(self):
+        return self.tsd_seq
+
+    def load(self, database: PgRawDatabase):
+        self.dungeon = database.getDungeon(self.dungeon_seq)
+        self.dungeon.subdungeons.append(self)
+
+
+# dungeonMonsterDropList.jsp
+# {
+#     "MONSTER_NO": "3427",
+#     "ORDER_IDX": "20",
+#     "STATUS": "0",
+#     "TDMD_SEQ": "967",
+#     "TDM_SEQ": "17816",
+#     "TSTAMP": "1489371218890"
+# },
+# Seems to be dedicated skillups only, like collab drops
+class PgDungeonMonsterDrop(PgItem):
+    __slots__ = ('tdmd_seq', 'monster_no', 'status', 'tdm_seq', 'monster', 'dungeon_monster')
+    _patch_fields = ('status',)
+    _link_fields = ('tdmd_seq', 'monster_no', 'tdm_seq')
+
+    @staticmethod
+    def file_name():
+        return 'dungeonMonsterDropList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.tdmd_seq = int(item['TDMD_SEQ'])  # unique id
+        self.monster_no = int(item['MONSTER_NO'])
+        self.status = item['STATUS']  # if 1, good, if 0, bad
+        self.tdm_seq = int(item['TDM_SEQ'])  # PgDungeonMonster id
+
+        self.monster = None  # type: PgMonster
+        self.dungeon_monster = None  # type: PgDungeonMonster
+
+    def key(self):
+        return self.tdmd_seq
+
+    def deleted(self):
+        # TODO: Should we be checking status == 1?
+        return False
+
+    def load(self, database: PgRawDatabase):
+        self.monster = database.getMonster(self.monster_no)
+        self.dungeon_monster = database.getDungeonMonster(self.tdm_seq)
+
+
+# dungeonMonsterList
+# {
+#     "AMOUNT": "1",
+#     "ATK": "9810",
+#     "COMMENT_JP": "",
+#     "COMMENT_KR": "",
+#     "COMMENT_US": "",
+#     "DEF": "340",
+#     "DROP_NO": "2789",
+#     "DUNGEON_SEQ": "150",
+#     "FLOOR": "5",
+#     "HP": "3011250",
+#     "MONSTER_NO": "2789",
+#     "ORDER_IDX": "50",
+#     "TDM_SEQ": "53122",
+#     "TSD_SEQ": "4564",
+#     "TSTAMP": "1480298353178",
+#     "TURN": "1"
+# },
+class PgDungeonMonster(PgItem):
+    __slots__ = ('tdm_seq', 'amount', 'atk', 'defence', 'drop_monster_no', 'dungeon_seq', 'floor',
+                 'hp', 'monster_no', 'order', 'tsd_seq', 'turn', 'skills', 'monster', 'dungeon',
+                 'drop_monster')
+    _sparse_containers = ('skills',)
+    _patch_fields = ('amount', 'atk', 'defence', 'floor', 'hp', 'order', 'tsd_seq', 'turn')
+    _link_fields = ('tdm_seq', 'drop_monster_no', 'dungeon_seq', 'monster_no')
+
+    @staticmethod
+    def file_name():
+        return 'dungeonMonsterList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.tdm_seq = int(item['TDM_SEQ'])  # unique id
+        self.amount = int(item['AMOUNT'])
+        self.atk = int(item['ATK'])
+        self.defence = int(item['DEF'])
+        self.drop_monster_no = int(item['DROP_NO'])  # PgMonster unique id
+        self.dungeon_seq = int(item['DUNGEON_SEQ'])  # PgDungeon uniqueId
+        self.floor = int(item['FLOOR'])
+        self.hp = int(item['HP'])
+        self.monster_no = int(item['MONSTER_NO'])  # PgMonster unique id
+        self.order = int(item['ORDER_IDX'])
+        self.tsd_seq = int(item['TSD_SEQ'])  # Sub Dungeon ID
+        self.turn = int(item['TURN'])
+
+        self.skills = []
+
+    def key(self):
+        return self.tdm_seq
+
+    def load(self, database: PgRawDatabase):
+        self.monster = database.getMonster(self.monster_no)
+
+        self.dungeon = database.getDungeon(self.dungeon_seq)
+        if self.dungeon:
+            self.dungeon.monsters.append(self)
+
+#         self.sub_dungeon = database.getSubDungeon(self.tsd_seq)
+#         self.sub_dungeon.monsters.append(self)
+#         self.sub_dungeon.floor_to_monsters[self.floor].append(self)
+
+        self.drop_monster = database.getMonster(self.drop_monster_no)
+        if self.drop_monster and self.dungeon:
+            self.drop_monster.drop_dungeons.append(self.dungeon)
+
+
+# {
+#     "TDM_SEQ": "15044", # dungeon monster
+#     "TDS_SEQ": "8934", # damage
+#     "TSTAMP": "100",
+#     "TS_SEQ": "2190" # skill
+# },
+class PgDungeonSkill(PgItem):
+    __slots__ = ('tdm_seq', 'tds_seq', 'ts_seq', 'dungeon_monster', 'damage', 'skill')
+
+    @staticmethod
+    def file_name():
+        return 'dungeonSkillList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.tdm_seq = int(item['TDM_SEQ'])
+        self.tds_seq = int(item['TDS_SEQ'])
+        self.ts_seq = int(item['TS_SEQ'])
+
+    def key(self):
+        return '{},{},{}'.format(self.tdm_seq, self.tds_seq, self.ts_seq)
+
+    def load(self, database: PgRawDatabase):
+        self.dungeon_monster = database.getDungeonMonster(self.tdm_seq)
+        if self.dungeon_monster:
+            self.dungeon_monster.skills.append(self)
+        self.damage = database.getDungeonDamage(self.tds_seq)
+        self.skill = database.getSkill(self.ts_seq)
+
+
+# {
+#     "DAMAGE": "16538.0",
+#     "TDS_SEQ": "14631",
+#     "TSTAMP": "1401764306350"
+# },
+class PgDungeonDamage(PgItem):
+    __slots__ = ('tds_seq', 'amount', 'monsters', 'floor_to_monsters')
+
+    @staticmethod
+    def file_name():
+        return 'dungeonSkillDamageList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.tds_seq = int(item['TDS_SEQ'])
+        self.amount = float(item['DAMAGE'])
+
+        self.monsters = []
+        self.floor_to_monsters = defaultdict(list)
+
+    def key(self):
+        return self.tds_seq
+
+    def load(self, database: PgRawDatabase):
+        pass
+
+
+# {
+#     "ORDER_IDX": "120",
+#     "TDT_NAME_JP": "\u30a2\u30f3\u30b1\u30fc\u30c8",
+#     "TDT_NAME_KR": "\uc559\ucf00\uc774\ud2b8",
+#     "TDT_NAME_US": "Survey",
+#     "TDT_SEQ": "9",
+#     "TSTAMP": "1388128221704"
+# },
+class PgDungeonType(PgItem):
+    __slots__ = ('name', 'tdt_seq')
+
+    @staticmethod
+    def file_name():
+        return 'dungeonTypeList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.name = item['TDT_NAME_US']
+        self.tdt_seq = int(item['TDT_SEQ'])
+
+    def key(self):
+        return self.tdt_seq
+
+    def load(self, database: PgRawDatabase):
+        pass
+
+
+class EvoType(Enum):
+    """Evo types supported by PadGuide. Numbers correspond to their id values."""
+    Base = -1  # Represents monsters who didn't require evo
+    Evo = 0
+    UvoAwoken = 1
+    UuvoReincarnated = 2
+
+
+# evolutionList
+# {
+#     "APP_VERSION": "",
+#     "COMMENT_JP": "",
+#     "COMMENT_KR": "",
+#     "COMMENT_US": "",
+#     "MONSTER_NO": "1",
+#     "TO_NO": "2",
+#     "TSTAMP": "1371788673999",
+#     "TV_SEQ": "331",
+#     "TV_TYPE": "0"
+# },
+class PgEvolution(PgItem):
+    __slots__ = ('tv_seq', 'from_monster_no', 'to_monster_no', 'tv_type', 'evo_type',
+                 'from_monster', 'to_monster')
+
+    @staticmethod
+    def file_name():
+        return 'evolutionList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.tv_seq = int(item['TV_SEQ'])  # unique id
+        self.from_monster_no = int(item['MONSTER_NO'])  # PgMonster id - base monster
+        self.to_monster_no = int(item['TO_NO'])  # PgMonster id - target monster
+        self.tv_type = int(item['TV_TYPE'])
+        self.evo_type = EvoType(self.tv_type)
+
+    def key(self):
+        return self.tv_seq
+
+    def deleted(self):
+        # Really rare and unusual bug
+        return self.from_monster_no == 0 or self.to_monster_no == 0
+
+    def load(self, database: PgRawDatabase):
+        self.from_monster = database.getMonster(self.from_monster_no)
+        self.to_monster = database.getMonster(self.to_monster_no)
+
+        if self.to_monster:
+            self.to_monster.cur_evo_type = self.evo_type
+            if self.from_monster:
+                self.to_monster.evo_from = self.from_monster
+                self.from_monster.evo_to.append(self.to_monster)
+
+
+# evoMaterialList
+# {
+#     "MONSTER_NO": "153",
+#     "ORDER_IDX": "1",
+#     "TEM_SEQ": "1429",
+#     "TSTAMP": "1371788674011",
+#     "TV_SEQ": "332"
+# },
+class PgEvolutionMaterial(PgItem):
+    __slots__ = ('tem_seq', 'tv_seq', 'fodder_monster_no', 'order', 'evolution', 'fodder_monster')
+    _patch_fields = ('order',)
+    _link_fields = ('tem_seq', 'tv_seq', 'fodder_monster_no')
+
+    @staticmethod
+    def file_name():
+        return 'evoMaterialList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.tem_seq = int(item['TEM_SEQ'])  # unique id
+        self.tv_seq = int(item['TV_SEQ'])  # evo id
+        self.fodder_monster_no = int(item['MONSTER_NO'])  # material monster
+        self.order = int(item['ORDER_IDX'])  # display order
+
+        self.evolution = None  # type: PgEvolution
+        self.fodder_monster = None  # type: PgMonster
+
+    def key(self):
+        return self.tem_seq
+
+    def load(self, database: PgRawDatabase):
+        self.evolution = database.getEvolution(self.tv_seq)
+        self.fodder_monster = database.getMonster(self.fodder_monster_no)
+
+        if self.evolution is None or self.evolution.to_monster is None:
+            # Really rare and unusual bug
+            return
+
+        target_monster = self.evolution.to_monster
+        # TODO: this is unsorted
+        target_monster.mats_for_evo.append(self.fodder_monster)
+
+        # Prevent issues if a monster is a mat for the same monster repeatedly (gunma, stones)
+        if target_monster not in self.fodder_monster.material_of:
+            self.fodder_monster.material_of.append(target_monster)
+
+
+# monsterAddInfoList
+# {
+#     "EXTRA_VAL1": "1",
+#     "EXTRA_VAL2": "",
+#     "EXTRA_VAL3": "",
+#     "EXTRA_VAL4": "",
+#     "EXTRA_VAL5": "",
+#     "MONSTER_NO": "3329",
+#     "SUB_TYPE": "0",
+#     "TSTAMP": "1480435906788"
+# },
+class PgMonsterAddInfo(PgItem):
+    """Optional extra information for a Monster.
+
+    Data is copied into PgMonster and this is discarded."""
+
+    __slots__ = ('monster_no', 'sub_type', 'extra_val_1')
+    _patch_fields = ('sub_type', 'extra_val_1')
+    _link_fields = ('monster_no',)
+
+    @staticmethod
+    def file_name():
+        return 'monsterAddInfoList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.monster_no = int(item['MONSTER_NO'])
+        self.sub_type = int(item['SUB_TYPE'])
+        self.extra_val_1 = int_or_none(item['EXTRA_VAL1'])
+
+    def key(self):
+        return self.monster_no
+
+    def load(self, database: PgRawDatabase):
+        pass
+
+    def patched_monsters(self, database: PgRawDatabase):
+        return [m for m in [database.getMonster(self.monster_no)] if m]
+
+
+# monsterInfoList
+# {
+#     "FODDER_EXP": "675.0",
+#     "HISTORY_JP": "[2016-12-16] \u65b0\u898f\u8ffd\u52a0",
+#     "HISTORY_KR": "[2016-12-16] \uc2e0\uaddc\ucd94\uac00",
+#     "HISTORY_US": "[2016-12-16] New Added",
+#     "MONSTER_NO": "3382",
+#     "ON_KR": "1",
+#     "ON_US": "1",
+#     "PAL_EGG": "0",
+#     "RARE_EGG": "0",
+#     "SELL_PRICE": "300.0",
+#     "TSR_SEQ": "86",
+#     "TSTAMP": "1481846935838"
+# },
+class PgMonsterInfo(PgItem):
+    """Extra information for a Monster.
+
+    Data is copied into PgMonster and this is discarded."""
+
+    __slots__ = ('monster_no', 'on_na', 'tsr_seq', 'in_pem', 'in_rem', 'history_us', 'series')
+    _patch_fields = ('on_na', 'in_pem', 'in_rem', 'history_us')
+    _link_fields = ('monster_no', 'tsr_seq')
+
+    @staticmethod
+    def file_name():
+        return 'monsterInfoList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.monster_no = int(item['MONSTER_NO'])
+        self.on_na = item['ON_US'] == '1'
+        self.tsr_seq = int_or_none(item['TSR_SEQ'])  # PgSeries id
+        self.in_pem = item['PAL_EGG'] == '1'
+        self.in_rem = item['RARE_EGG'] == '1'
+        self.history_us = sys.intern(item['HISTORY_US'])
+
+    def key(self):
+        return self.monster_no
+
+    def load(self, database: PgRawDatabase):
+        self.series = database.getSeries(self.tsr_seq)
+
+    def patched_monsters(self, database: PgRawDatabase):
+        return [m for m in [database.getMonster(self.monster_no)] if m]
+
+
+# monsterList
+# {
+#     "APP_VERSION": "0.0",
+#     "ATK_MAX": "1985",
+#     "ATK_MIN": "695",
+#     "COMMENT_JP": "",
+#     "COMMENT_KR": "\uc77c\ubcf8",
+#     "COMMENT_US": "Japan",
+#     "COST": "60",
+#     "EXP": "10000000",
+#     "HP_MAX": "6258",
+#     "HP_MIN": "3528",
+#     "LEVEL": "99",
+#     "MONSTER_NO": "3646",
+#     "MONSTER_NO_JP": "3646",
+#     "MONSTER_NO_KR": "3646",
+#     "MONSTER_NO_US": "3646",
+#     "PRONUNCIATION_JP": "\u304b\u306a\u305f\u306a\u308b\u3082\u306e\u30fb\u3088\u3050\u305d\u3068\u30fc\u3059",
+#     "RARITY": "7",
+#     "RATIO_ATK": "1.5",
+#     "RATIO_HP": "1.5",
+#     "RATIO_RCV": "1.5",
+#     "RCV_MAX": "233",
+#     "RCV_MIN": "926",
+#     "REG_DATE": "2017-04-27 17:29:48.0",
+#     "TA_SEQ": "4",
+#     "TA_SEQ_SUB": "0",
+#     "TE_SEQ": "14",
+#     "TM_NAME_JP": "\u5f7c\u65b9\u306a\u308b\u3082\u306e\u30fb\u30e8\u30b0\uff1d\u30bd\u30c8\u30fc\u30b9",
+#     "TM_NAME_KR": "\u5f7c\u65b9\u306a\u308b\u3082\u306e\u30fb\u30e8\u30b0\uff1d\u30bd\u30c8\u30fc\u30b9",
+#     "TM_NAME_US": "\u5f7c\u65b9\u306a\u308b\u3082\u306e\u30fb\u30e8\u30b0\uff1d\u30bd\u30c8\u30fc\u30b9",
+#     "TSTAMP": "1494033700775",
+#     "TS_SEQ_LEADER": "12448",
+#     "TS_SEQ_SKILL": "12447",
+#     "TT_SEQ": "10",
+#     "TT_SEQ_SUB": "1"
+# }
+class PgMonster(PgItem):
+    __slots__ = ('monster_no', 'monster_no_na', 'monster_no_jp', 'min_hp', 'min_atk', 'min_rcv',
+                 'hp', 'atk', 'rcv', 'ts_seq_active', 'ts_seq_leader', 'rarity', 'cost', 'exp',
+                 'max_level', 'name_na', 'name_jp', 'ta_seq_1', 'ta_seq_2', 'te_seq',
+                 'tt_seq_1', 'tt_seq_2', 'debug_info', 'weighted_stats', 'roma_subname',
+                 'active_skill', 'leader_skill', 'cur_evo_type', 'evo_to', 'evo_from',
+                 'mats_for_evo', 'material_of', 'awakenings', 'drop_dungeons', 'alt_evos',
+                 'rotating_skillups', 'server_actives', 'future_skillup_rotation', 'is_equip',
+                 'base_monster', 'limitbreak_stats', 'superawakening_count',
+                 'translated_jp_name', 'leader_skill_data', 'attr1', 'attr2', 'type1', 'type2',
+                 'type3', 'assist_setting', 'on_na', 'series', 'is_gfe', 'in_pem', 'in_rem',
+                 'pem_evo', 'rem_evo', 'history_us', 'sell_mp', 'buy_mp', 'in_mpshop', 'mp_evo',
+                 'farmable', 'farmable_evo', 'types', 'search', 'is_inheritable',
+                 # So that RetiredGeneration can tell if a replaced database's monsters leaked
+                 '__weakref__')
+    _sparse_containers = ('evo_to', 'mats_for_evo', 'material_of', 'awakenings', 'drop_dungeons',
+                          'rotating_skillups', 'server_actives', 'future_skillup_rotation')
+    _patch_fields = ('min_hp', 'min_atk', 'min_rcv', 'hp', 'atk', 'rcv', 'rarity', 'cost', 'exp',
+                     'max_level', 'name_na', 'name_jp', 'ta_seq_1', 'ta_seq_2', 'te_seq',
+                     'tt_seq_1', 'tt_seq_2', 'debug_info', 'weighted_stats', 'roma_subname',
+                     'limitbreak_stats')
+    _link_fields = ('monster_no', 'monster_no_na', 'monster_no_jp', 'ts_seq_active',
+                    'ts_seq_leader')
+
+    @staticmethod
+    def file_name():
+        return 'monsterList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.monster_no = int(item['MONSTER_NO'])
+        self.monster_no_na = int(item['MONSTER_NO_US'])
+        self.monster_no_jp = int(item['MONSTER_NO_JP'])
+        self.min_hp = int(item['HP_MIN'])
+        self.min_atk = int(item['ATK_MIN'])
+        self.min_rcv = int(item['RCV_MIN'])
+        self.hp = int(item['HP_MAX'])
+        self.atk = int(item['ATK_MAX'])
+        self.rcv = int(item['RCV_MAX'])
+        self.ts_seq_active = int_or_none(item['TS_SEQ_SKILL'])
+        self.ts_seq_leader = int_or_none(item['TS_SEQ_LEADER'])
+        self.rarity = int(item['RARITY'])
+        self.cost = int(item['COST'])
+        self.exp = int(item['EXP'])
+        self.max_level = int(item['LEVEL'])
+        self.name_na = item['TM_NAME_US']
+        self.name_jp = item['TM_NAME_JP']
+        self.ta_seq_1 = int(item['TA_SEQ'])  # PgAttribute id
+        self.ta_seq_2 = int(item['TA_SEQ_SUB'])  # PgAttribute id
+        self.te_seq = int(item['TE_SEQ'])
+        self.tt_seq_1 = int(item['TT_SEQ'])  # PgType id
+        self.tt_seq_2 = int(item['TT_SEQ_SUB'])  # PgType id
+
+        self.debug_info = ''
+        self.weighted_stats = int(self.hp / 10 + self.atk / 5 + self.rcv / 3)
+
+        self.roma_subname = None
+        if self.name_na == self.name_jp:
+            self.roma_subname = make_roma_subname(self.name_jp)
+        else:
+            # Remove annoying stuff from NA names, like Jörmungandr
+            self.name_na = rpadutils.rmdiacritics(self.name_na)
+
+        self.active_skill = None  # type: PgSkill
+        self.leader_skill = None  # type: PgSkill
+
+        # ???
+        self.cur_evo_type = EvoType.Base
+        self.evo_to = []
+        self.evo_from = None
+
+        self.mats_for_evo = []
+        self.material_of = []
+
+        self.awakenings = []  # PgAwakening
+        self.drop_dungeons = []
+
+        self.alt_evos = []  # PgMonster
+
+        # List of PgSkillRotationDated
+        self.rotating_skillups = []
+        self.server_actives = {}  # str(NA, JP) -> PgSkill
+        self.future_skillup_rotation = {}
+
+        self.is_equip = False
+        self.is_inheritable = False
+
+        # Filled in once the dungeon drops are loaded
+        self.farmable = False
+        self.farmable_evo = False
+
+        # Monsters start off pointing to themselves as the base, this will
+        # change once the MonsterGroups are computed.
+        self.base_monster = self
+
+        # Data populated via override
+        self.limitbreak_stats = 1 + float(item['LIMIT_MULT']) / 100 if item['LIMIT_MULT'] else None
+        self.superawakening_count = 0
+
+        # Data filled in post-load
+        self.translated_jp_name = None
+
+    def key(self):
+        return self.monster_no
+
+    def load(self, database: PgRawDatabase):
+        self.active_skill = database.getSkill(self.ts_seq_active)
+        if self.active_skill:
+            self.active_skill.monsters_with_active.append(self)
+
+        self.leader_skill = database.getSkill(self.ts_seq_leader)
+        self.leader_skill_data = database.getSkillLeaderData(self.ts_seq_leader)
+        if self.leader_skill:
+            self.leader_skill.monsters_with_leader.append(self)
+
+        monster_info = database.getMonsterInfo(self.monster_no)
+        self.series = database.getSeries(monster_info.tsr_seq)  # PgSeries
+        self.series.monsters.append(self)
+        self.is_gfe = self.series.tsr_seq == 34  # godfest
+
+        self.load_details(database)
+
+    def load_details(self, database: PgRawDatabase):
+        """Copies in the values from other tables which don't link back to this monster.
+
+        Called again when this monster or one of those rows is patched in place.
+        """
+        self.attr1 = database.getAttributeEnum(self.ta_seq_1)
+        self.attr2 = database.getAttributeEnum(self.ta_seq_2)
+
+        self.type1 = database.getTypeName(self.tt_seq_1)
+        self.type2 = database.getTypeName(self.tt_seq_2)
+        self.type3 = None
+
+        self.assist_setting = None
+        monster_add_info = database.getMonsterAddInfo(self.monster_no)
+        if monster_add_info:
+            self.type3 = database.getTypeName(monster_add_info.sub_type)
+            self.assist_setting = monster_add_info.extra_val_1
+
+        monster_info = database.getMonsterInfo(self.monster_no)
+        self.on_na = monster_info.on_na
+        self.in_pem = monster_info.in_pem
+        self.in_rem = monster_info.in_rem
+        self.pem_evo = self.in_pem
+        self.rem_evo = self.in_rem
+        self.history_us = monster_info.history_us
+
+        monster_price = database.getMonsterPrice(self.monster_no)
+        self.sell_mp = monster_price.sell_mp if monster_price else 0
+        self.buy_mp = monster_price.buy_mp if monster_price else 0
+        self.in_mpshop = self.buy_mp > 0
+        self.mp_evo = self.in_mpshop
+
+    def patched_monsters(self, database: PgRawDatabase):
+        return [self]
+
+    def finalize(self):
+        self.types = [sys.intern(t.lower()) for t in [self.type1, self.type2, self.type3] if t]
+        self.search = MonsterSearchHelper(self)
+
+    def finalize_evolutions(self):
+        """Fills in everything that depends on awakenings and evolutions."""
+        self.awakenings.sort(key=lambda x: x.order)
+        self.superawakening_count = sum(int(a.is_super) for a in self.awakenings)
+
+        if self.assist_setting == 1:
+            self.is_inheritable = True
+        elif self.assist_setting == 2:
+            self.is_inheritable = False
+        else:
+            has_awakenings = len(self.awakenings) > 0
+            self.is_inheritable = has_awakenings and self.rarity >= 5 and self.sell_mp >= 3000
+
+        self.is_equip = 'Awoken Assist' in [a.get_name() for a in self.awakenings]
+
+        if self.evo_from is None:
+            def link(m: PgMonster, alt_evos: list):
+                alt_evos.append(m)
+                m.alt_evos = alt_evos
+                for em in m.evo_to:
+                    link(em, alt_evos)
+            link(self, [])
+
+    def finalize_drops(self):
+        """Fills in everything that depends on dungeon drops."""
+        self.farmable = len(self.drop_dungeons) > 0
+        self.farmable_evo = self.farmable
+
+
+class MonsterSearchHelper(object):
+    __slots__ = ('name', 'leader', 'active_name', 'active_desc', 'active', 'active_min',
+                 'active_max', 'color', 'hascolor', 'limitbreak_stats', 'hp', 'atk', 'rcv',
+                 'weighted_stats', 'types', 'board_change', 'orb_convert', 'row_convert',
+                 'column_convert')
+
+    def __init__(self, m: PgMonster):
+
+        self.name = '{} {}'.format(m.name_na, m.name_jp).lower()
+        self.leader = m.leader_skill.desc.lower() if m.leader_skill else ''
+        self.active_name = m.active_skill.name.lower() if m.active_skill else ''
+        self.active_desc = m.active_skill.desc.lower() if m.active_skill else ''
+        self.active = '{} {}'.format(self.active_name, self.active_desc)
+        self.active_min = m.active_skill.turn_min if m.active_skill else None
+        self.active_max = m.active_skill.turn_max if m.active_skill else None
+
+        self.color = [sys.intern(m.attr1.name.lower())]
+        self.hascolor = [sys.intern(c.name.lower()) for c in [m.attr1, m.attr2] if c]
+
+        self.limitbreak_stats = m.limitbreak_stats or 1
+
+        self.hp = m.hp * self.limitbreak_stats
+        self.atk = m.atk * self.limitbreak_stats
+        self.rcv = m.rcv * self.limitbreak_stats
+        self.weighted_stats = m.weighted_stats * self.limitbreak_stats
+
+        self.types = m.types
+
+        def replace_colors(text: str):
+            return text.replace('red', 'fire').replace('blue', 'water').replace('green', 'wood')
+        # Evolutions usually share skills, so most of these strings are repeated
+        self.leader = sys.intern(replace_colors(self.leader))
+        self.active = sys.intern(replace_colors(self.active))
+        self.active_name = sys.intern(replace_colors(self.active_name))
+        self.active_desc = sys.intern(replace_colors(self.active_desc))
+
+        self.board_change = []
+        self.orb_convert = defaultdict(list)
+        self.row_convert = []
+        self.column_convert = []
+
+        def color_txt_to_list(txt):
+            txt = txt.replace('and', ' ')
+            txt = txt.replace(',', ' ')
+            txt = txt.replace('orbs', ' ')
+            txt = txt.replace('orb', ' ')
+            txt = txt.replace('mortal poison', 'mortalpoison')
+            txt = txt.replace('jammers', 'jammer')
+            txt = txt.strip()
+            return txt.split()
+
+        def strip_prev_clause(txt: str, sep: str):
+            prev_clause_start_idx = txt.find(sep)
+            if prev_clause_start_idx >= 0:
+                prev_clause_start_idx += len(sep)
+                txt = txt[prev_clause_start_idx:]
+            return txt
+
+        def strip_next_clause(txt: str, sep: str):
+            next_clause_start_idx = txt.find(sep)
+            if next_clause_start_idx >= 0:
+                txt = txt[:next_clause_start_idx]
+            return txt
+
+        active_desc = self.active_desc
+        active_desc = active_desc.replace(' rows ', ' row ')
+        active_desc = active_desc.replace(' columns ', ' column ')
+        active_desc = active_desc.replace(' into ', ' to ')
+        active_desc = active_desc.replace('changes orbs to', 'all orbs to')
+
+        board_change_txt = 'all orbs to'
+        if board_change_txt in active_desc:
+            txt = strip_prev_clause(active_desc, board_change_txt)
+            txt = strip_next_clause(txt, 'orbs')
+            txt = strip_next_clause(txt, ';')
+            self.board_change = color_txt_to_list(txt)
+
+        txt = active_desc
+        if 'row' in txt:
+            parts = re.split('\Wand\W|;\W', txt)
+            for i in range(0, len(parts)):
+                if 'row' in parts[i]:
+                    self.row_convert.append(strip_next_clause(
+                        strip_prev_clause(parts[i], 'to '), ' orbs'))
+
+        txt = active_desc
+        if 'column' in txt:
+            parts = re.split('\Wand\W|;\W', txt)
+            for i in range(0, len(parts)):
+                if 'column' in parts[i]:
+                    self.column_convert.append(strip_next_clause(
+                        strip_prev_clause(parts[i], 'to '), ' orbs'))
+
+        convert_done = self.board_change or self.row_convert or self.column_convert
+
+        change_txt = 'change '
+        if not convert_done and change_txt in active_desc and 'orb' in active_desc:
+            txt = active_desc
+            parts = re.split('\Wand\W|;\W', txt)
+            for i in range(0, len(parts)):
+                parts[i] = strip_prev_clause(parts[i], change_txt) if change_txt in parts[i] else ''
+
+            for part in parts:
+                sub_parts = part.split(' to ')
+                if len(sub_parts) > 1:
+                    source_orbs = color_txt_to_list(sub_parts[0])
+                    dest_orbs = color_txt_to_list(sub_parts[1])
+                    for so in source_orbs:
+                        for do in dest_orbs:
+                            self.orb_convert[so].append(do)
+
+
+class MonsterGroup(object):
+    """Computes shared values across a tree of monsters and injects them."""
+
+    def __init__(self, base_monster: PgMonster):
+        self.base_monster = base_monster
+        self.members = list()
+        self._recursive_add(base_monster)
+        self._initialize_members()
+
+    def _recursive_add(self, m: PgMonster):
+        m.base_monster = self.base_monster
+        self.members.append(m)
+        for em in m.evo_to:
+            self._recursive_add(em)
+
+    def _initialize_members(self):
+        # Compute tree acquisition status
+        farmable_evo, pem_evo, rem_evo, mp_evo = False, False, False, False
+        for m in self.members:
+            farmable_evo = farmable_evo or m.farmable
+            pem_evo = pem_evo or m.in_pem
+            rem_evo = rem_evo or m.in_rem
+            mp_evo = mp_evo or m.in_mpshop
+
+        # Override tree acquisition status
+        for m in self.members:
+            m.farmable_evo = farmable_evo
+            m.pem_evo = pem_evo
+            m.rem_evo = rem_evo
+            m.mp_evo = mp_evo
+
+
+# monsterPriceList
+# {
+#     "BUY_PRICE": "0",
+#     "MONSTER_NO": "3577",
+#     "SELL_PRICE": "99",
+#     "TSTAMP": "1492101772974"
+# }
+
+
+class PgMonsterPrice(PgItem):
+    __slots__ = ('monster_no', 'buy_mp', 'sell_mp')
+    _patch_fields = ('buy_mp', 'sell_mp')
+    _link_fields = ('monster_no',)
+
+    @staticmethod
+    def file_name():
+        return 'monsterPriceList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.monster_no = int(item['MONSTER_NO'])
+        self.buy_mp = int(item['BUY_PRICE'])
+        self.sell_mp = int(item['SELL_PRICE'])
+
+    def key(self):
+        return self.monster_no
+
+    def load(self, database: PgRawDatabase):
+        pass
+
+    def patched_monsters(self, database: PgRawDatabase):
+        return [m for m in [database.getMonster(self.monster_no)] if m]
+
+
+# seriesList
+# {
+#     "DEL_YN": "N",
+#     "NAME_JP": "\u308a\u3093",
+#     "NAME_KR": "\uc2ac\ub77c\uc784",
+#     "NAME_US": "Slime",
+#     "SEARCH_DATA": "\u308a\u3093 Slime \uc2ac\ub77c\uc784",
+#     "TSR_SEQ": "3",
+#     "TSTAMP": "1380587210667"
+# },
+class PgSeries(PgItem):
+    __slots__ = ('tsr_seq', 'name', 'deleted_yn', 'monsters')
+    _sparse_containers = ('monsters',)
+    _patch_fields = ('name', 'deleted_yn')
+    _link_fields = ('tsr_seq',)
+
+    @staticmethod
+    def file_name():
+        return 'seriesList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.tsr_seq = int(item['TSR_SEQ'])
+        self.name = item['NAME_US']
+        self.deleted_yn = item['DEL_YN']  # Either Y(discard) or N.
+
+        self.monsters = []
+
+    def key(self):
+        return self.tsr_seq
+
+    def deleted(self):
+        return False
+        # Temporary
+#         return self.deleted_yn == 'Y'
+
+    def load(self, database: PgRawDatabase):
+        pass
+
+
+# skillList
+# {
+#     "MAG_ATK": "0.0",
+#     "MAG_HP": "0.0",
+#     "MAG_RCV": "0.0",
+#     "ORDER_IDX": "3",
+#     "REDUCE_DMG": "0.0",
+#     "RTA_SEQ_1": "0",
+#     "RTA_SEQ_2": "0",
+#     "SEARCH_DATA": "\u6e9c\u3081\u65ac\u308a \u6e9c\u3081\u65ac\u308a \u6e9c\u3081\u65ac\u308a 2\u30bf\u30fc\u30f3\u306e\u9593\u3001\u30c1\u30fc\u30e0\u5185\u306e\u30c9\u30e9\u30b4\u30f3\u30ad\u30e9\u30fc\u306e\u899a\u9192\u6570\u306b\u5fdc\u3058\u3066\u653b\u6483\u529b\u304c\u4e0a\u6607\u3002(1\u500b\u306b\u3064\u304d50%) Increase ATK depending on number of Dragon Killer Awakening Skills on team for 2 turns (50% per each) 2\ud134\uac04 \ud300\ub0b4\uc758 \ub4dc\ub798\uace4 \ud0ac\ub7ec \uac01\uc131 \uac2f\uc218\uc5d0 \ub530\ub77c \uacf5\uaca9\ub825\uc774 \uc0c1\uc2b9 (\uac1c\ub2f9 50%)",
+#     "TA_SEQ_1": "0",
+#     "TA_SEQ_2": "0",
+#     "TSTAMP": "1493861895693",
+#     "TS_DESC_JP": "2\u30bf\u30fc\u30f3\u306e\u9593\u3001\u30c1\u30fc\u30e0\u5185\u306e\u30c9\u30e9\u30b4\u30f3\u30ad\u30e9\u30fc\u306e\u899a\u9192\u6570\u306b\u5fdc\u3058\u3066\u653b\u6483\u529b\u304c\u4e0a\u6607\u3002(1\u500b\u306b\u3064\u304d50%)",
+#     "TS_DESC_KR": "2\ud134\uac04 \ud300\ub0b4\uc758 \ub4dc\ub798\uace4 \ud0ac\ub7ec \uac01\uc131 \uac2f\uc218\uc5d0 \ub530\ub77c \uacf5\uaca9\ub825\uc774 \uc0c1\uc2b9 (\uac1c\ub2f9 50%)",
+#     "TS_DESC_US": "Increase ATK depending on number of Dragon Killer Awakening Skills on team for 2 turns (50% per each)",
+#     "TS_NAME_JP": "\u6e9c\u3081\u65ac\u308a",
+#     "TS_NAME_KR": "\u6e9c\u3081\u65ac\u308a",
+#     "TS_NAME_US": "\u6e9c\u3081\u65ac\u308a",
+#     "TS_SEQ": "12478",
+#     "TT_SEQ_1": "0",
+#     "TT_SEQ_2": "0",
+#     "TURN_MAX": "22",
+#     "TURN_MIN": "14",
+#     "T_CONDITION": "3"
+# }
+class PgSkill(PgItem):
+    __slots__ = ('ts_seq', 'name', 'desc', 'turn_min', 'turn_max', 'monsters_with_active',
+                 'monsters_with_leader', 'monsters_with_awakening', 'server_skillups')
+    _sparse_containers = ('monsters_with_active', 'monsters_with_leader', 'monsters_with_awakening',
+                          'server_skillups')
+    _patch_fields = ('name', 'desc', 'turn_min', 'turn_max')
+    _link_fields = ('ts_seq',)
+
+    @staticmethod
+    def file_name():
+        return 'skillList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.ts_seq = int(item['TS_SEQ'])
+        self.name = item['TS_NAME_US']
+        self.desc = sys.intern(item['TS_DESC_US'])
+        self.turn_min = int(item['TURN_MIN'])
+        self.turn_max = int(item['TURN_MAX'])
+
+        self.monsters_with_active = []  # PgMonster
+        self.monsters_with_leader = []  # PgMonster
+        self.monsters_with_awakening = []  # PgMonster
+
+        # str (NA, JP) -> PgMonster
+        self.server_skillups = {}
+
+    def key(self):
+        return self.ts_seq
+
+    def load(self, database: PgRawDatabase):
+        pass
+
+    def patched_monsters(self, database: PgRawDatabase):
+        # Awakening names feed into is_equip
+        return self.monsters_with_active + self.monsters_with_leader + self.monsters_with_awakening
+
+
+# skillLeaderDataList
+#
+# PgSkillLeaderData
+# 4 pipe delimited fields, each field is a condition
+# Slashes separate effects for conditions
+# 1: Code 1=HP, 2=ATK, 3=RCV, 4=Reduction
+# 2: Multiplier
+# 3: Color restriction (coded)
+# 4: Type restriction (coded)
+# 5: Combo restriction
+#
+# Reincarnated Izanagi, 4x + 50% for heal cross, 2x atk 2x rcv for god/dragon/balanced
+# {
+#     "LEADER_DATA": "4/0.5///|2/4///|2/2//6,1,2/|3/2//6,1,2/",
+#     "TSTAMP": "1487553365770",
+#     "TS_SEQ": "11695"
+# },
+# Gold Saint, Shion : 4.5X atk when 3+ light combo
+# {
+#     "LEADER_DATA": "2/4.5///3",
+#     "TSTAMP": "1432940060708",
+#     "TS_SEQ": "6661"
+# },
+# Reincarnated Minerva, 3x damage, 2x damage, color resist
+# {
+#     "LEADER_DATA": "2/3/1//|2/2///|4/0.5/1,4,5//",
+#     "TSTAMP": "1475243514648",
+#     "TS_SEQ": "10835"
+# },
+class PgSkillLeaderData(PgItem):
+    __slots__ = ('ts_seq', 'leader_data', 'hp', 'atk', 'rcv', 'resist')
+    _patch_fields = ('leader_data', 'hp', 'atk', 'rcv', 'resist')
+    _link_fields = ('ts_seq',)
+
+    @staticmethod
+    def empty():
+        return PgSkillLeaderData({
+            'TS_SEQ': '-1',
+            'LEADER_DATA': '',
+        })
+
+    @staticmethod
+    def file_name():
+        return 'skillLeaderDataList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.ts_seq = int(item['TS_SEQ'])  # unique id
+        self.leader_data = item['LEADER_DATA']
+
+        hp, atk, rcv, resist = (1.0,) * 4
+        for mod in self.leader_data.split('|'):
+            if not mod.strip():
+                continue
+            items = mod.split('/')
+
+            code = items[0]
+            mult = float(items[1])
+            if code == '1':
+                hp *= mult
+            if code == '2':
+                atk *= mult
+            if code == '3':
+                rcv *= mult
+            if code == '4':
+                resist *= mult
+
+        self.hp = hp
+        self.atk = atk
+        self.rcv = rcv
+        self.resist = resist
+
+    def key(self):
+        return self.ts_seq
+
+    def load(self, database: PgRawDatabase):
+        pass
+
+    def get_data(self):
+        return self.hp, self.atk, self.rcv, self.resist
+
+
+# skillRotationList
+# {
+#     "MONSTER_NO": "915",
+#     "SERVER": "JP",
+#     "STATUS": "0",
+#     "TSR_SEQ": "2",
+#     "TSTAMP": "1481627094573"
+# }
+class PgSkillRotation(PgItem):
+    __slots__ = ('tsr_seq', 'monster_no', 'server', 'status', 'monster')
+
+    @staticmethod
+    def file_name():
+        return 'skillRotationList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.tsr_seq = int(item['TSR_SEQ'])  # unique id
+        self.monster_no = int(item['MONSTER_NO'])
+        self.server = normalizeServer(item['SERVER'])  # JP, NA, KR
+        # Status seems to be rarely '2'
+        self.status = int(item['STATUS'])
+
+    def key(self):
+        return self.tsr_seq
+
+    def deleted(self):
+        return self.server == 'KR' or self.status != 0  # We don't do KR
+
+    def load(self, database: PgRawDatabase):
+        self.monster = database.getMonster(self.monster_no)
+
+
+# skillRotationListList
+# {
+#     "ROTATION_DATE": "2016-12-14",
+#     "STATUS": "0",
+#     "TSRL_SEQ": "960",
+#     "TSR_SEQ": "86",
+#     "TSTAMP": "1481627993157",
+#     "TS_SEQ": "9926"
+# }
+class PgSkillRotationDated(PgItem):
+    __slots__ = ('tsrl_seq', 'tsr_seq', 'ts_seq', 'rotation_date_str', 'rotation_date', 'skill',
+                 'skill_rotation')
+
+    @staticmethod
+    def file_name():
+        return 'skillRotationListList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.tsrl_seq = int(item['TSRL_SEQ'])  # unique id
+        self.tsr_seq = int(item['TSR_SEQ'])  # PgSkillRotation id - Current skillup monster
+        self.ts_seq = int(item['TS_SEQ'])  # PGSkill id - Current skill
+        self.rotation_date_str = sys.intern(item['ROTATION_DATE'])
+
+        self.rotation_date = None
+        if len(self.rotation_date_str):
+            self.rotation_date = datetime.strptime(self.rotation_date_str, "%Y-%m-%d").date()
+
+    def key(self):
+        return self.tsrl_seq
+
+    def load(self, database: PgRawDatabase):
+        self.skill = database.getSkill(self.ts_seq)
+        self.skill_rotation = database.getSkillRotation(self.tsr_seq)
+
+        if self.skill_rotation:
+            self.skill_rotation.monster.rotating_skillups.append(self)
+
+
+class SkillRotationIndex(object):
+    """Tracks the current and upcoming rotating skillups for each server.
+
+    Fills in PgMonster.server_actives, PgMonster.future_skillup_rotation and
+    PgSkill.server_skillups. The rotations are sorted by date, so when a server's date rolls
+    over, only the rotations that started since the last update need to be applied.
+    """
+
+    SERVER_TIMEZONES = {
+        'JP': rpadutils.JP_TZ_OBJ,
+        'NA': rpadutils.NA_TZ_OBJ,
+    }
+
+    def __init__(self, rotations):
+        # server -> PgSkillRotationDated sorted by rotation_date, and their dates
+        self._rotations = {}
+        self._dates = {}
+        # (server, monster_no) -> (dates, rotations) for one monster, sorted by date
+        self._monster_rotations = {}
+        # server -> number of rotations in _rotations which have started
+        self._started_count = {}
+        # server -> date that _started_count was computed for
+        self._server_dates = {}
+        # server -> monster_no -> monsters with a rotation that has started
+        self._active_monsters = {}
+
+        for server in self.SERVER_TIMEZONES:
+            server_rotations = sorted(
+                (r for r in rotations
+                 if r.skill_rotation and r.skill_rotation.server == server and r.rotation_date),
+                key=lambda r: r.rotation_date)
+            self._rotations[server] = server_rotations
+            self._dates[server] = [r.rotation_date for r in server_rotations]
+            self._started_count[server] = 0
+            self._active_monsters[server] = {}
+            for r in server_rotations:
+                dates, monster_rotations = self._monster_rotations.setdefault(
+                    (server, r.skill_rotation.monster_no), ([], []))
+                dates.append(r.rotation_date)
+                monster_rotations.append(r)
+
+        self.advance()
+
+    def active_monsters(self, server: str):
+        """Returns the monsters with a current rotating skillup on the server."""
+        monsters = self._active_monsters[server]
+        return [monsters[monster_no] for monster_no in sorted(monsters)]
+
+    def advance(self):
+        """Applies the rotations that started since the last call.
+
+        Only does any work the first time it's called on a new server date.
+        """
+        for server, server_tz in self.SERVER_TIMEZONES.items():
+            server_now = datetime.now(server_tz).date()
+            if self._server_dates.get(server) != server_now:
+                self._advance_server(server, server_now)
+
+    def _advance_server(self, server: str, server_now):
+        first_update = server not in self._server_dates
+        previously_started = self._started_count[server]
+        started = max(bisect.bisect_right(self._dates[server], server_now), previously_started)
+        self._server_dates[server] = server_now
+        self._started_count[server] = started
+
+        # The first time through, every monster needs its upcoming rotation filled in
+        changed = self._rotations[server] if first_update else \
+            self._rotations[server][previously_started:started]
+        changed_monsters = collections.OrderedDict(
+            (r.skill_rotation.monster_no, r.skill_rotation.monster) for r in changed)
+
+        # The dicts are replaced rather than modified, since empty ones are shared
+        for monster_no, m in changed_monsters.items():
+            dates, monster_rotations = self._monster_rotations[server, monster_no]
+            monster_started = bisect.bisect_right(dates, server_now)
+
+            future_skillup_rotation = dict(m.future_skillup_rotation)
+            if monster_started < len(monster_rotations):
+                future_skillup_rotation[server] = monster_rotations[monster_started]
+            else:
+                future_skillup_rotation.pop(server, None)
+            m.future_skillup_rotation = future_skillup_rotation
+
+            if monster_started == 0:
+                continue
+            skill = monster_rotations[monster_started - 1].skill
+            replaced_skill = m.server_actives.get(server)
+            server_actives = dict(m.server_actives)
+            server_actives[server] = skill
+            m.server_actives = server_actives
+            self._active_monsters[server][monster_no] = m
+
+            # The skill the monster rotated off of isn't a current skillup through it any more
+            if replaced_skill is not None and replaced_skill is not skill and \
+                    replaced_skill.server_skillups.get(server) is m:
+                server_skillups = dict(replaced_skill.server_skillups)
+                del server_skillups[server]
+                replaced_skill.server_skillups = server_skillups
+
+            server_skillups = dict(skill.server_skillups)
+            server_skillups[server] = m
+            skill.server_skillups = server_skillups
+
+
+# typeList
+# {
+#     "ORDER_IDX": "2",
+#     "TSTAMP": "1375363406092",
+#     "TT_NAME_JP": "\u60aa\u9b54",
+#     "TT_NAME_KR": "\uc545\ub9c8",
+#     "TT_NAME_US": "Devil",
+#     "TT_SEQ": "10"
+# },
+class PgType(PgItem):
+    __slots__ = ('tt_seq', 'name')
+
+    @staticmethod
+    def file_name():
+        return 'typeList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.tt_seq = int(item['TT_SEQ'])  # unique id
+        self.name = item['TT_NAME_US']
+
+    def key(self):
+        return self.tt_seq
+
+    def load(self, database: PgRawDatabase):
+        pass
+
+
+class PgMonsterDropInfoCombined(object):
+    def __init__(self, monster_id, dungeon_monster_drop, dungeon_monster, dungeon):
+        self.monster_id = monster_id
+        self.dungeon_monster_drop = dungeon_monster_drop
+        self.dungeon_monster = dungeon_monster
+        self.dungeon = dungeon
+
+
+# ================================================================================
+# PadRem items below
+# ================================================================================
+
+class RemType(Enum):
+    godfest = 1
+    rare = 2
+    pal = 3
+    unknown1 = 4
+
+
+class RemRowType(Enum):
+    subsection = 0
+    divider = 1
+
+
+# eggTitleList
+#       {
+#            "DEL_YN": "N",
+#            "END_DATE": "2016-10-24 07:59:00",
+#            "ORDER_IDX": "0",
+#            "SERVER": "US",
+#            "SHOW_YN": "Y",
+#            "START_DATE": "2016-10-17 08:00:00",
+#            "TEC_SEQ": "2",
+#            "TET_SEQ": "64",
+#            "TSTAMP": "1476490114488",
+#            "TYPE": "1"
+#        },
+class PgEggInstance(PgItem):
+    __slots__ = ('server', 'deleted_yn', 'show_yn', 'rem_type', 'tet_seq', 'row_type', 'order',
+                 'start_date_str', 'end_date_str', 'egg_name_us', 'egg_monsters',
+                 'start_datetime', 'end_datetime', 'open_date_str')
+    _sparse_containers = ('egg_monsters',)
+    _patch_fields = ('server', 'deleted_yn', 'show_yn', 'rem_type', 'row_type', 'order',
+                     'start_date_str', 'end_date_str', 'start_datetime', 'end_datetime',
+                     'open_date_str')
+    _link_fields = ('tet_seq',)
+
+    @staticmethod
+    def file_name():
+        return 'eggTitleList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.server = normalizeServer(item['SERVER'])
+        self.deleted_yn = item['DEL_YN']  # Y, N
+        self.show_yn = item['SHOW_YN']  # Y, N
+        self.rem_type = RemType(int(item['TEC_SEQ']))  # matches RemType
+        self.tet_seq = int(item['TET_SEQ'])  # primary key
+        self.row_type = RemRowType(int(item['TYPE']))  # 0-> row with just name, 1-> row with date
+
+        self.order = int(item["ORDER_IDX"])
+        self.start_date_str = sys.intern(item['START_DATE'])
+        self.end_date_str = sys.intern(item['END_DATE'])
+
+        self.egg_name_us = None
+        self.egg_monsters = []
+
+        tz = pytz.UTC
+        self.start_datetime = None
+        self.end_datetime = None
+        self.open_date_str = None
+
+#         self.pt_date_str = None
+        if len(self.start_date_str):
+            self.start_datetime = datetime.strptime(
+                self.start_date_str, "%Y-%m-%d %H:%M:%S").replace(tzinfo=tz)
+            self.end_datetime = datetime.strptime(
+                self.end_date_str, "%Y-%m-%d %H:%M:%S").replace(tzinfo=tz)
+
+            if self.server == 'NA':
+                pt_tz_obj = pytz.timezone('America/Los_Angeles')
+                self.open_date_str = self.start_datetime.replace(tzinfo=pt_tz_obj).strftime('%m/%d')
+            if self.server == 'JP':
+                jp_tz_obj = pytz.timezone('Asia/Tokyo')
+                self.open_date_str = self.start_datetime.replace(tzinfo=jp_tz_obj).strftime('%m/%d')
+
+    def key(self):
+        return self.tet_seq
+
+    def deleted(self):
+        return (self.deleted_yn == 'Y' or
+                self.show_yn == 'N' or
+                self.server == 'KR' or
+                self.rem_type in (RemType.pal, RemType.unknown1))
+
+    def load(self, database: PgRawDatabase):
+        pass
+#         self.monster = database.getMonster(self.monster_no)
+
+
+# eggMonsterList
+#        {
+#            "DEL_YN": "Y",
+#            "MONSTER_NO": "120",
+#            "ORDER_IDX": "1",
+#            "TEM_SEQ": "1",
+#            "TET_SEQ": "1",
+#            "TSTAMP": "1405245537715"
+#        },
+class PgEggMonster(PgItem):
+    __slots__ = ('deleted_yn', 'monster_no', 'tem_seq', 'tet_seq', 'monster', 'egg_instance')
+    _patch_fields = ('deleted_yn',)
+    _link_fields = ('monster_no', 'tem_seq', 'tet_seq')
+
+    @staticmethod
+    def file_name():
+        return 'eggMonsterList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.deleted_yn = item['DEL_YN']
+        self.monster_no = int(item['MONSTER_NO'])
+        self.tem_seq = int(item['TEM_SEQ'])  # primary key
+        self.tet_seq = int(item['TET_SEQ'])  # fk to PgEggInstance
+
+    def key(self):
+        return self.tem_seq
+
+    def deleted(self):
+        return self.deleted_yn == 'Y' or self.monster_no == 0
+
+    def load(self, database: PgRawDatabase):
+        self.monster = database.getMonster(self.monster_no)
+        self.egg_instance = database.getEggInstance(self.tet_seq)
+        if self.egg_instance:
+            # For KR stuff we clipped out
+            self.egg_instance.egg_monsters.append(self)
+
+
+# eggTitleNameList
+#        {
+#            "DEL_YN": "N",
+#            "LANGUAGE": "US",
+#            "NAME": "Batman Egg",
+#            "TETN_SEQ": "183",
+#            "TET_SEQ": "64",
+#            "TSTAMP": "1441589491425"
+#        },
+class PgEggName(PgItem):
+    __slots__ = ('name', 'language', 'deleted_yn', 'tetn_seq', 'tet_seq', 'egg_instance')
+    _patch_fields = ('name', 'language', 'deleted_yn')
+    _link_fields = ('tetn_seq', 'tet_seq')
+
+    @staticmethod
+    def file_name():
+        return 'eggTitleNameList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.name = item['NAME']
+        self.language = sys.intern(item['LANGUAGE'])  # US, JP, KR
+        self.deleted_yn = item['DEL_YN']  # Y, N
+        self.tetn_seq = int(item['TETN_SEQ'])  # primary key
+        self.tet_seq = int(item['TET_SEQ'])  # fk to PgEggInstance
+
+    def key(self):
+        return self.tetn_seq
+
+    def deleted(self):
+        return self.deleted_yn == 'Y' or self.language != 'US'
+
+    def load(self, database: PgRawDatabase):
+        self.egg_instance = database.getEggInstance(self.tet_seq)
+        if self.egg_instance:
+            # For KR stuff we clipped out
+            self.egg_instance.egg_name_us = self
+
+
+# ================================================================================
+# PadEvents items below
+# ================================================================================
+
+
+class EventType(Enum):
+    EventTypeWeek = 0
+    EventTypeSpecial = 1
+    EventTypeSpecialWeek = 2
+    EventTypeGuerrilla = 3
+    EventTypeGuerrillaNew = 4
+    EventTypeEtc = -100
+
+
+def normalizeServer(server):
+    server = server.upper()
+    return 'NA' if server == 'US' else sys.intern(server)
+
+
+# {
+#     "CLOSE_DATE": "2017-09-01",
+#     "CLOSE_HOUR": "19",
+#     "CLOSE_MINUTE": "59",
+#     "CLOSE_WEEKDAY": "0",
+#     "DUNGEON_SEQ": "31",
+#     "EVENT_SEQ": "25",
+#     "EVENT_TYPE": "-100",
+#     "OPEN_DATE": "2017-09-01",
+#     "OPEN_HOUR": "08",
+#     "OPEN_MINUTE": "00",
+#     "OPEN_WEEKDAY": "0",
+#     "SCHEDULE_SEQ": "235217",
+#     "SERVER": "US",
+#     "SERVER_OPEN_DATE": "2017-09-01",
+#     "SERVER_OPEN_HOUR": "1",
+#     "TEAM_DATA": "0",
+#     "TSTAMP": "1504233623450",
+#     "URL": ""
+# },
+class PgScheduledEvent(PgItem):
+    __slots__ = ('schedule_seq', 'open_timestamp', 'close_timestamp', 'dungeon_seq', 'event_seq',
+                 'event_type', 'server', 'team_data', 'url', 'group', 'open_datetime',
+                 'close_datetime', 'dungeon', 'event')
+    _patch_fields = ('open_timestamp', 'close_timestamp', 'event_type', 'server', 'team_data',
+                     'url', 'group', 'open_datetime', 'close_datetime')
+    _link_fields = ('schedule_seq', 'dungeon_seq', 'event_seq')
+
+    @staticmethod
+    def file_name():
+        return 'scheduleList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.schedule_seq = int(item['SCHEDULE_SEQ'])
+
+        self.open_timestamp = int(item['OPEN_TIMESTAMP'])
+        self.close_timestamp = int(item['CLOSE_TIMESTAMP'])
+
+        self.dungeon_seq = int(item['DUNGEON_SEQ'])
+        self.event_seq = int(item['EVENT_SEQ'])
+        self.event_type = int(item['EVENT_TYPE'])
+
+        self.server = normalizeServer(item['SERVER'])
+
+        self.team_data = int_or_none(item['TEAM_DATA'])
+        self.url = item['URL']
+
+        self.group = None
+        if self.team_data is not None:
+            if self.event_type == EventType.EventTypeGuerrilla.value:
+                self.group = chr(ord('a') + self.team_data).upper()
+            elif self.event_type == EventType.EventTypeSpecialWeek.value:
+                self.group = ['RED', 'BLUE', 'GREEN'][self.team_data]
+
+        self.open_datetime = datetime.utcfromtimestamp(
+            self.open_timestamp).replace(tzinfo=pytz.UTC)
+        self.close_datetime = datetime.utcfromtimestamp(
+            self.close_timestamp).replace(tzinfo=pytz.UTC)
+
+    def key(self):
+        return self.schedule_seq
+
+    def deleted(self):
+        return self.server == 'KR'
+
+    def load(self, database: PgRawDatabase):
+        self.dungeon = database.getDungeon(self.dungeon_seq)
+        self.event = database.getEvent(self.event_seq) if self.event_seq != '0' else None
+
+
+# {
+#     "EVENT_NAME_JP": "\u30b3\u30a4\u30f3 1.5\u500d!",
+#     "EVENT_NAME_KR": "\ucf54\uc778 1.5\ubc30!",
+#     "EVENT_NAME_US": "Coin x 1.5!",
+#     "EVENT_SEQ": "3",
+#     "TSTAMP": "1370174967128"
+# },
+class PgEvent(PgItem):
+    __slots__ = ('event_seq', 'name')
+    _patch_fields = ('name',)
+    _link_fields = ('event_seq',)
+
+    @staticmethod
+    def file_name():
+        return 'eventList'
+
+    def __init__(self, item):
+        super().__init__()
+        self.event_seq = int(item['EVENT_SEQ'])
+        self.name = item['EVENT_NAME_US']
+
+    def key(self):
+        return self.event_seq
+
+    def load(self, database: PgRawDatabase):
+        pass
+
+
+CORE_ITEM_GROUP = 'core'
+
+# Every PgItem type that PgRawDatabase loads from disk, grouped by how they link together.
+# Items in the core group modify each other while loading. Items in the other groups only
+# read from the core group (and modify items in their own group), so they can be rebuilt
+# on their own if the core group has not changed.
+DATABASE_ITEM_GROUPS = [
+    (CORE_ITEM_GROUP, [
+        PgAttribute,
+        PgAwakening,
+        PgDungeon,
+        PgDungeonMonster,
+        PgEvent,
+        PgEvolution,
+        PgEvolutionMaterial,
+        PgMonster,
+        PgMonsterAddInfo,
+        PgMonsterInfo,
+        PgMonsterPrice,
+        PgSeries,
+        PgSkillLeaderData,
+        PgSkill,
+        PgSkillRotation,
+        PgSkillRotationDated,
+        PgType,
+    ]),
+    ('drops', [
+        PgDungeonMonsterDrop,
+    ]),
+    ('schedule', [
+        PgScheduledEvent,
+    ]),
+    ('eggs', [
+        PgEggInstance,
+        PgEggMonster,
+        PgEggName,
+    ]),
+]
+
+DATABASE_ITEM_TYPES = [itemtype for _, itemtypes in DATABASE_ITEM_GROUPS for itemtype in itemtypes]
+
+
+ITEM_TYPE_BY_FILE_NAME = {itemtype.file_name(): itemtype for itemtype in DATABASE_ITEM_TYPES}
+
+
+def write_export_if_changed(file_path, content, content_hashes: dict):
+    """Atomically replaces file_path with content, unless it already has that content.
+
+    content is either bytes, or a str which is written as UTF-8.
+    content_hashes caches the sha1 of every file written, so unchanged files don't need to
+    be read back. Returns True if the file was written.
+    """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    content_hash = hashlib.sha1(data).hexdigest()
+    if not os.path.exists(file_path):
+        content_hashes.pop(file_path, None)
+    elif file_path not in content_hashes:
+        with open(file_path, 'rb') as f:
+            content_hashes[file_path] = hashlib.sha1(f.read()).hexdigest()
+
+    if content_hashes.get(file_path) == content_hash:
+        return False
+
+    tmp_path = file_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, file_path)
+    content_hashes[file_path] = content_hash
+    return True
+
+
+# The monster store: a read-only copy of the tables needed to look up monsters, compiled
+# into one file which can be memory-mapped, so bot processes on the same machine share a
+# single copy of the pages instead of each holding the data in its own heap.
+#
+# Layout: a header (magic, version, directory length), a JSON directory of the tables, then
+# for each table the sorted int32 keys, count + 1 uint32 record offsets, and the records as
+# JSON lists. Integers use the native byte order; the file isn't meant to leave the machine.
+MONSTER_STORE_PATH = 'data/padguide2/monster_store.bin'
+MONSTER_STORE_MAGIC = b'PGMS'
+MONSTER_STORE_VERSION = 1
+_MONSTER_STORE_HEADER = struct.Struct('=4sII')
+
+# Table name, item type, and fields. Fields are attribute names, or (name, getter) pairs.
+# Links to other PgItems are stored as the key of the linked item.
+MONSTER_STORE_TABLES = [
+    ('monsters', PgMonster, [
+        'monster_no', 'monster_no_na', 'monster_no_jp', 'name_na', 'name_jp',
+        'translated_jp_name', 'roma_subname', 'rarity', 'cost', 'exp', 'max_level', 'min_hp',
+        'min_atk', 'min_rcv', 'hp', 'atk', 'rcv', 'weighted_stats', 'limitbreak_stats', 'attr1',
+        'attr2', 'type1', 'type2', 'type3', 'active_skill', 'leader_skill', 'awakenings',
+        'superawakening_count', 'cur_evo_type', 'evo_from', 'evo_to', 'base_monster',
+        'alt_evos', 'mats_for_evo', 'material_of', 'on_na', 'is_gfe', 'in_pem', 'in_rem',
+        'pem_evo', 'rem_evo', 'in_mpshop', 'mp_evo', 'farmable', 'farmable_evo', 'sell_mp',
+        'buy_mp', 'is_inheritable', 'is_equip', 'assist_setting', 'history_us',
+        ('series_name', lambda m: m.series.name if m.series else None),
+    ]),
+    ('skills', PgSkill, [
+        'ts_seq', 'name', 'desc', 'turn_min', 'turn_max', 'monsters_with_active',
+        'monsters_with_leader', 'monsters_with_awakening',
+    ]),
+    ('awakenings', PgAwakening, [
+        'tma_seq', 'monster_no', 'ts_seq', 'order', 'is_super',
+        ('name', lambda a: a.get_name()),
+    ]),
+    ('evolutions', PgEvolution, [
+        'tv_seq', 'from_monster_no', 'to_monster_no', 'evo_type',
+    ]),
+]
+
+
+def _store_value(value):
+    """Converts an item attribute to something JSON serializable for the monster store."""
+    if isinstance(value, PgItem):
+        return value.key()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [_store_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _store_value(v) for k, v in value.items()}
+    return value
+
+
+def _store_getters(fields):
+    """Returns (name, getter) pairs for the fields of a MONSTER_STORE_TABLES entry."""
+    return [(f, operator.attrgetter(f)) if isinstance(f, str) else f for f in fields]
+
+
+def build_monster_store(database: PgRawDatabase):
+    """Compiles the monster store tables of database into the bytes of a store file."""
+    directory = collections.OrderedDict()
+    body = bytearray()
+    for table_name, itemtype, fields in MONSTER_STORE_TABLES:
+        getters = _store_getters(fields)
+        items = sorted(database._table_maps.get(itemtype.file_name(), {}).values(),
+                       key=lambda i: i.key())
+
+        keys = array.array('i', (item.key() for item in items))
+        offsets = array.array('I', [0])
+        data = bytearray()
+        for item in items:
+            record = [_store_value(getter(item)) for _, getter in getters]
+            data += json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            offsets.append(len(data))
+
+        directory[table_name] = {
+            'fields': [name for name, _ in getters],
+            'count': len(items),
+            'keys': len(body),
+            'offsets': len(body) + keys.itemsize * len(keys),
+            'data': len(body) + keys.itemsize * len(keys) + offsets.itemsize * len(offsets),
+        }
+        body += keys.tobytes()
+        body += offsets.tobytes()
+        body += data
+        # Keep the next table's arrays aligned
+        body += b'\0' * (-len(body) % 4)
+
+    directory_bytes = json.dumps(directory).encode('utf-8')
+    header = _MONSTER_STORE_HEADER.pack(
+        MONSTER_STORE_MAGIC, MONSTER_STORE_VERSION, len(directory_bytes))
+    return header + directory_bytes + bytes(body)
+
+
+def write_monster_store(database: PgRawDatabase, file_path: str, content_hashes: dict):
+    """Writes the monster store for database, if it changed. Returns True if it was written.
+
+    The file is replaced atomically, so readers keep using the old pages until they refresh.
+    """
+    return write_export_if_changed(file_path, build_monster_store(database), content_hashes)
+
+
+class _MonsterStoreTable(object):
+    def __init__(self, name: str, body: memoryview, entry: dict):
+        self.record_type = collections.namedtuple('Stored' + name.title(), entry['fields'])
+        count = entry['count']
+        self._keys = body[entry['keys']:entry['keys'] + 4 * count].cast('i')
+        self._offsets = body[entry['offsets']:entry['offsets'] + 4 * (count + 1)].cast('I')
+        self._data = body[entry['data']:]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def get(self, key: int):
+        idx = bisect.bisect_left(self._keys, key)
+        if idx == len(self._keys) or self._keys[idx] != key:
+            return None
+        return self.record(idx)
+
+    def record(self, idx: int):
+        raw = bytes(self._data[self._offsets[idx]:self._offsets[idx + 1]])
+        return self.record_type(*json.loads(raw.decode('utf-8')))
+
+
+class MonsterStore(object):
+    """Read-only, memory-mapped view of a file written by write_monster_store.
+
+    Records are namedtuples with the fields in MONSTER_STORE_TABLES; links to other items hold
+    the key of the linked item, e.g. getSkill(monster.active_skill). Call refresh()
+    periodically to switch to the newest file after a refresh replaces it, and close() once
+    done with the store.
+    """
+
+    def __init__(self, file_path: str=MONSTER_STORE_PATH):
+        self.file_path = file_path
+        self._file_id = None
+        self._mapped = None
+        self._tables = {}
+        self.refresh()
+
+    def refresh(self):
+        """Maps the current file if it was replaced since the last call. Returns True if so."""
+        file_stat = os.stat(self.file_path)
+        file_id = (file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+        if file_id == self._file_id:
+            return False
+
+        with open(self.file_path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, directory_size = _MONSTER_STORE_HEADER.unpack_from(mapped)
+        if magic != MONSTER_STORE_MAGIC or version != MONSTER_STORE_VERSION:
+            raise ValueError('{} is not a version {} monster store'.format(
+                self.file_path, MONSTER_STORE_VERSION))
+
+        body_start = _MONSTER_STORE_HEADER.size + directory_size
+        directory = json.loads(mapped[_MONSTER_STORE_HEADER.size:body_start].decode('utf-8'))
+        body = memoryview(mapped)[body_start:]
+
+        # Lookups in progress keep using the tables they started with; the old mapping is
+        # released once nothing references it
+        self._tables = {name: _MonsterStoreTable(name, body, entry)
+                        for name, entry in directory.items()}
+        self._mapped = mapped
+        self._file_id = file_id
+        return True
+
+    def close(self):
+        """Unmaps the file. Records already read stay valid, but nothing else can be read."""
+        self._tables = {}
+        self._file_id = None
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    def table_sizes(self):
+        return {name: len(table) for name, table in self._tables.items()}
+
+    def _get(self, table_name: str, key):
+        table = self._tables.get(table_name)
+        return table.get(key) if table and key is not None else None
+
+    def all_monsters(self):
+        table = self._tables['monsters']
+        return [table.record(idx) for idx in range(len(table))]
+
+    def getMonster(self, monster_no: int):
+        return self._get('monsters', monster_no)
+
+    def getSkill(self, ts_seq: int):
+        return self._get('skills', ts_seq)
+
+    def getAwakening(self, tma_seq: int):
+        return self._get('awakenings', tma_seq)
+
+    def getEvolution(self, tv_seq: int):
+        return self._get('evolutions', tv_seq)
+
+
+# Newline-delimited JSON requests can carry a few thousand bulk lookups
+QUERY_SERVICE_LINE_LIMIT = 4 * 1024 * 1024
+# Maximum number of monsters returned by a search request
+QUERY_SEARCH_MAX_RESULTS = 1000
+
+
+def _contains_filter(field):
+    # Substring match for text fields, membership for list fields like color and types
+    return lambda value: lambda m: str(value).lower() in getattr(m.search, field)
+
+
+def _min_filter(field):
+    return lambda value: lambda m: getattr(m.search, field) >= value
+
+
+def _flag_filter(field):
+    return lambda value: lambda m: bool(getattr(m, field)) == bool(value)
+
+
+# Search request filter name -> function from the filter value to a monster predicate
+QUERY_SEARCH_FILTERS = {
+    'name': _contains_filter('name'),
+    'leader': _contains_filter('leader'),
+    'active': _contains_filter('active'),
+    'color': _contains_filter('color'),
+    'hascolor': _contains_filter('hascolor'),
+    'type': _contains_filter('types'),
+    'hp': _min_filter('hp'),
+    'atk': _min_filter('atk'),
+    'rcv': _min_filter('rcv'),
+    'weighted': _min_filter('weighted_stats'),
+    'farmable': _flag_filter('farmable'),
+    'inheritable': _flag_filter('is_inheritable'),
+    'on_na': _flag_filter('on_na'),
+}
+
+_MONSTER_RECORD_GETTERS = _store_getters(MONSTER_STORE_TABLES[0][2])
+
+
+def monster_record(m: PgMonster):
+    """Converts a monster to a JSON serializable dict, with the monster store fields."""
+    return {name: _store_value(getter(m)) for name, getter in _MONSTER_RECORD_GETTERS}
+
+
+class QueryService(object):
+    """Answers lookups against the published database over a local Unix socket.
+
+    Each line sent is a JSON request, and is answered with one line of JSON. A request is an
+    object with an 'op' and its arguments:
+        {"op": "monster", "monster_no": 1234}
+        {"op": "find", "query": "sonia"}
+        {"op": "search", "filters": {"color": "fire", "type": "dragon"}, "limit": 100}
+        {"op": "info"}
+    or a list of them, which is answered with a list of responses in the same order. Every
+    request in a list is answered from the same database generation.
+    """
+
+    def __init__(self, cog, socket_path: str):
+        self.cog = cog
+        self.socket_path = socket_path
+        self.server = None
+        self.requests_served = 0
+        self._ops = {
+            'monster': self._op_monster,
+            'find': self._op_find,
+            'search': self._op_search,
+            'info': self._op_info,
+        }
+
+    async def start(self):
+        self._remove_socket()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only processes running as the bot's user can connect. The socket is created with
+        # those permissions, so nobody can connect before they're applied.
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        finally:
+            os.umask(old_umask)
+        self.server = await asyncio.start_unix_server(
+            self._handle_client, sock=sock, loop=self.cog.bot.loop,
+            limit=QUERY_SERVICE_LINE_LIMIT)
+        print('PadGuide2 query service listening on', self.socket_path)
+
+    def close(self):
+        if self.server:
+            self.server.close()
+            self.server = None
+        self._remove_socket()
+
+    def _remove_socket(self):
+        # Only ever remove a socket left by a previous run, not a file that happens to be
+        # at the configured path
+        try:
+            if stat.S_ISSOCK(os.lstat(self.socket_path).st_mode):
+                os.remove(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self.handle_line(line)
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+        except Exception as ex:
+            print('query service client failed', ex)
+        finally:
+            writer.close()
+
+    async def handle_line(self, line: bytes):
+        try:
+            request = json.loads(line.decode('utf-8'))
+        except ValueError as ex:
+            return {'ok': False, 'error': 'invalid JSON: {}'.format(ex)}
+
+        # Capture the generation up front, so a swap mid-request can't mix databases
+        generation = (self.cog.generation, self.cog.database, self.cog.index)
+        if not isinstance(request, list):
+            return self.handle_request(request, *generation)
+
+        responses = []
+        for r in request:
+            responses.append(self.handle_request(r, *generation))
+            # Lookups run on the bot's loop; let other tasks in between them
+            await asyncio.sleep(0)
+        return responses
+
+    def handle_request(self, request, generation: int, database: PgRawDatabase, index):
+        self.requests_served += 1
+        try:
+            if not isinstance(request, dict):
+                raise ValueError('request must be an object')
+            op = self._ops.get(request.get('op'))
+            if op is None:
+                raise ValueError('unknown op: {}'.format(request.get('op')))
+            result = op(request, database, index)
+            return {'ok': True, 'generation': generation, 'result': result}
+        except Exception as ex:
+            return {'ok': False, 'error': str(ex)}
+
+    def _op_monster(self, request, database: PgRawDatabase, index):
+        m = database.getMonster(int(request['monster_no']))
+        return monster_record(m) if m else None
+
+    def _op_find(self, request, database: PgRawDatabase, index):
+        nm, err, debug_info = index.find_monster(str(request['query']))
+        return {
+            'monster_no': nm.monster_no if nm else None,
+            'monster_no_na': nm.monster_no_na if nm else None,
+            'name_na': nm.name_na if nm else None,
+            'error': err,
+            'debug_info': debug_info,
+        }
+
+    def _op_search(self, request, database: PgRawDatabase, index):
+        predicates = []
+        for name, value in request.get('filters', {}).items():
+            if name not in QUERY_SEARCH_FILTERS:
+                raise ValueError('unknown filter: {}'.format(name))
+            predicates.append(QUERY_SEARCH_FILTERS[name](value))
+        limit = min(int(request.get('limit', 100)), QUERY_SEARCH_MAX_RESULTS)
+
+        matches = [m for m in database.all_monsters() if all(p(m) for p in predicates)]
+        matches.sort(key=lambda m: m.monster_no_na, reverse=True)
+        return {
+            'count': len(matches),
+            'monster_nos': [m.monster_no for m in matches[:limit]],
+        }
+
+    def _op_info(self, request, database: PgRawDatabase, index):
+        return {
+            'monsters': len(database.all_monsters()),
+            'ready': [tier for tier in READINESS_TIERS if self.cog.is_ready(tier)],
+            'requests_served': self.requests_served,
+        }
+
+
+class LoadProfile(object):
+    """Per-phase and per-table timings and object counts for loading a database or index."""
+
+    def __init__(self):
+        # Every phase in the order they ran
+        self.phases = []
+        # file_name -> stat name -> value
+        self.tables = defaultdict(dict)
+        # name -> number of objects
+        self.counts = {}
+        self._current_phase = None
+
+    def begin_phase(self, name: str):
+        """Starts timing a phase, ending the current one."""
+        self.end_phase()
+        self._current_phase = (name, time.perf_counter(), sys.getallocatedblocks())
+
+    def end_phase(self):
+        if self._current_phase is None:
+            return
+        name, start_time, start_blocks = self._current_phase
+        self.phases.append({
+            'phase': name,
+            'ms': elapsed_ms(start_time),
+            # Roughly the number of objects created (and still alive) during the phase
+            'net_allocated_blocks': sys.getallocatedblocks() - start_blocks,
+        })
+        self._current_phase = None
+
+    def add_table_stat(self, file_name: str, stat: str, value):
+        table_stats = self.tables[file_name]
+        table_stats[stat] = table_stats.get(stat, 0) + value
+
+    def to_json(self):
+        return {
+            'phases': self.phases,
+            'tables': {file_name: {k: round(v, 1) for k, v in stats.items()}
+                       for file_name, stats in self.tables.items()},
+            'counts': self.counts,
+        }
+
+
+class RowStamps(object):
+    """The key and TSTAMP of every row in a PadGuide table.
+
+    Every PadGuide row carries a TSTAMP which is bumped when the row is modified, so the rows
+    which changed between two loads of a table are the ones whose stamps differ.
+    """
+
+    __slots__ = ('keys', 'tstamps')
+
+    def __init__(self, stamps: dict):
+        # Kept as flat sequences rather than a dict, since there's an entry for every row
+        self.keys = list(stamps.keys())
+        self.tstamps = array.array('q', stamps.values())
+
+    def to_dict(self):
+        return dict(zip(self.keys, self.tstamps))
+
+
+class RowPatch(object):
+    """Rows of a database which changed in place. See PgRawDatabase.plan_row_patch."""
+
+    def __init__(self, source_hashes: dict, source_stats: dict, load_profile: LoadProfile):
+        self.source_hashes = source_hashes
+        self.source_stats = source_stats
+        self.load_profile = load_profile
+        # file_name -> RowStamps for every table which changed
+        self.table_stamps = {}
+        # (current item, item built from its changed row)
+        self.updates = []
+
+
+def _row_tstamp(row):
+    return int(row.get('TSTAMP') or 0)
+
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _JsonStream(object):
+    """Reads JSON values one at a time out of a file, holding only a chunk in memory."""
+
+    def __init__(self, f, chunk_size):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """Appends the next chunk to the unconsumed part of the buffer. False at EOF."""
+        if self._eof:
+            return False
+        chunk = self._f.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            self._pos = _JSON_WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError('Unexpected end of JSON')
+
+    def expect(self, chars):
+        c = self.peek()
+        if c not in chars:
+            raise ValueError('Expected one of {!r} but found {!r}'.format(chars, c))
+        self._pos += 1
+        return c
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A number running up to the end of the buffer (or into another number
+                # character) might have been cut off by the chunk boundary
+                if self._eof or (end < len(self._buf) and self._buf[end] not in '0123456789.eE+-'):
+                    self._pos = end
+                    return value
+            except ValueError:
+                if self._eof:
+                    raise
+            self._fill()
+
+
+def iter_json_items(file_path, chunk_size=1 << 16):
+    """Yields the rows of the top-level 'items' list of a PadGuide JSON file one by one.
+
+    The other top-level keys are parsed and skipped. Raises ValueError if the file is not
+    valid JSON; rows before the error will already have been yielded.
+    """
+    with open(file_path, encoding='utf-8') as f:
+        stream = _JsonStream(f, chunk_size)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+        while True:
+            key = stream.decode()
+            stream.expect(':')
+            if key == 'items':
+                stream.expect('[')
+                if stream.peek() == ']':
+                    stream.expect(']')
+                else:
+                    while True:
+                        yield stream.decode()
+                        if stream.expect(',]') == ']':
+                            break
+            else:
+                stream.decode()
+            if stream.expect(',}') == '}':
+                return
+
+
+def make_roma_subname(name_jp):
+    subname = name_jp.replace('＝', '')
+    adjusted_subname = ''
+    for part in subname.split('・'):
+        roma_part = romkan.to_roma(part)
+        if part != roma_part and not rpadutils.containsJp(roma_part):
+            adjusted_subname += ' ' + roma_part.strip('-')
+    return adjusted_subname.strip()
+
+
+# Dropped from readings: separators, the long vowel mark and romkan's n' disambiguation
+READING_IGNORED_CHARS = str.maketrans('', '', ' ・＝=-ー\'')
+
+# Runs of kanji, or of anything else but separators; readings start at each run
+READING_SEGMENT_REGEX = re.compile(r'[\u4e00-\u9faf]+|[^\s・＝=\u4e00-\u9faf]+')
+
+
+def reading_key(text: str):
+    """Folds hiragana, katakana (including half-width) and romaji spellings to one romaji form.
+
+    Romaji is left as typed; romkan reads 'nn' as a single ん, so round-tripping it through
+    kana would break spellings like 'jannu'.
+    """
+    text = unicodedata.normalize('NFKC', text).lower()
+    return romkan.to_roma(text).translate(READING_IGNORED_CHARS)
+
+
+def name_reading_keys(name_jp: str):
+    """The reading keys for a JP name: the whole name, and the rest of it from each segment.
+
+    Kanji can't be romanized, so the segments let kana and romaji queries find names like
+    超覚醒ゼウス by the part after the kanji.
+    """
+    name_jp = unicodedata.normalize('NFKC', name_jp)
+    keys = {reading_key(name_jp[match.start():])
+            for match in READING_SEGMENT_REGEX.finditer(name_jp)}
+    keys.discard('')
+    return keys
+
+
+def elapsed_ms(start_time: float):
+    return int((time.perf_counter() - start_time) * 1000)
+
+
+def in_chunks(items, size: int=LINK_CHUNK_SIZE):
+    """Yields lists of up to size items from an iterable."""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+_SLOT_NAMES = {}
+
+
+def _slot_names(cls):
+    """Every __slots__ entry of cls and its base classes."""
+    names = _SLOT_NAMES.get(cls)
+    if names is None:
+        names = tuple(name for klass in reversed(cls.__mro__)
+                      for name in klass.__dict__.get('__slots__', ()) if name != '__weakref__')
+        _SLOT_NAMES[cls] = names
+    return names
+
+
+class RetiredGeneration(object):
+    """Weak references to a database generation which was replaced or unloaded.
+
+    Nothing should hold on to a replaced generation once the other cogs have refreshed
+    their data, so if it's still alive after GENERATION_LEAK_GRACE_SECS, it's reported as a
+    leak along with whatever is holding it.
+    """
+
+    def __init__(self, generation: int, database: PgRawDatabase, index, replacement=None):
+        self.generation = generation
+        self.retired_time = time.time()
+        self.leak_reported = False
+        self._database = weakref.ref(database) if database else None
+        self._index = weakref.ref(index) if index else None
+
+        # Monsters shared with the replacement (because the core tables didn't change) are
+        # still in use, so they're not tracked
+        self._monsters = []
+        if database and not (replacement and replacement._monster_map is database._monster_map):
+            self._monsters = [weakref.ref(m) for m in database._monster_map.values()]
+
+    def age_secs(self):
+        return int(time.time() - self.retired_time)
+
+    def alive_objects(self):
+        """The database, index and monsters of this generation which are still alive."""
+        refs = [self._database, self._index] + self._monsters
+        return [obj for obj in (ref() for ref in refs if ref) if obj is not None]
+
+    def describe(self):
+        alive = self.alive_objects()
+        monster_count = sum(isinstance(obj, PgMonster) for obj in alive)
+        msg = 'Generation {} replaced {}s ago: database {}, index {}, {} of {} monsters alive'.format(
+            self.generation, self.age_secs(),
+            'alive' if self._database and self._database() else 'freed',
+            'alive' if self._index and self._index() else 'freed',
+            monster_count, len(self._monsters))
+        holders = find_holders(alive)
+        if holders:
+            msg += '\n  held by: ' + ', '.join(
+                '{} x{}'.format(name, count) for name, count in holders.most_common(10))
+        return msg
+
+
+def check_retired_generations(retired_generations, grace_secs=GENERATION_LEAK_GRACE_SECS):
+    """Warns about retired generations alive for longer than grace_secs.
+
+    Returns the generations which are still alive.
+    """
+    gc.collect()
+    still_alive = []
+    for retired in retired_generations:
+        if not retired.alive_objects():
+            continue
+        still_alive.append(retired)
+        if retired.age_secs() >= grace_secs and not retired.leak_reported:
+            retired.leak_reported = True
+            print('WARNING: PadGuide2 database leaked.', retired.describe())
+    return still_alive
+
+
+def find_holders(objects, max_depth=3):
+    """Counts the objects outside of any database which keep objects alive, by type name.
+
+    Walks up the referrers of objects through plain containers to the first objects which
+    aren't containers (e.g. a cog, or a PgRemWrapper). References from other database items
+    are ignored, since they belong to the same generation.
+    """
+    holders = collections.Counter()
+    target_ids = set(map(id, objects))
+    seen = target_ids | {id(objects)}
+    for _ in range(max_depth):
+        if not target_ids:
+            break
+        # gc.get_referrers compares against every argument for every object on the heap,
+        # which is far too slow for thousands of monsters, so scan the heap directly
+        next_target_ids = set()
+        for obj in gc.get_objects():
+            if id(obj) in seen or isinstance(obj, (PgItem, PgRawDatabase, MonsterGroup,
+                                                   types.FrameType)):
+                continue
+            if not any(id(referent) in target_ids for referent in gc.get_referents(obj)):
+                continue
+            seen.add(id(obj))
+            if type(obj) in (list, dict, tuple, set, frozenset):
+                next_target_ids.add(id(obj))
+            elif isinstance(obj, types.ModuleType):
+                holders['module ' + obj.__name__] += 1
+            else:
+                holders[type(obj).__name__] += 1
+        target_ids = next_target_ids
+    return holders
+
+
+def _deep_sizeof(root, seen: set):
+    """Sums the size of root and every object it references, stopping at other PgItems.
+
+    Objects whose id is already in seen are skipped, so shared objects are counted once.
+    """
+    size = 0
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        if obj is not root and isinstance(obj, (PgItem, Enum, type)):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, '__dict__'):
+                stack.append(obj.__dict__)
+            for name in _slot_names(type(obj)):
+                if hasattr(obj, name):
+                    stack.append(getattr(obj, name))
+    return size
+
+
+def reset_peak_rss():
+    """Resets the peak RSS tracked by the kernel, so peak_rss_mb covers just one refresh.
+
+    Only supported on Linux; elsewhere this does nothing.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def peak_rss_mb():
+    """The peak RSS of the bot process in MB, or None if not available (non-Linux)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+def int_or_none(maybe_int: str):
+    return int(maybe_int) if maybe_int else None
+
+
+def float_or_none(maybe_float: str):
+    return float(maybe_float) if maybe_float else None
+
+
+def csv_to_tuples(file_path: str, cols: int=2):
+    # Loads a two-column CSV into an array of tuples.
+    results = []
+    with open(file_path, encoding='utf-8') as f:
+        file_reader = csv.reader(f, delimiter=',')
+        for row in file_reader:
+            if len(row) < 2:
+                continue
+
+            data = [None] * cols
+            for i in range(0, min(cols, len(row))):
+                data[i] = row[i].strip()
+
+            if not len(data[0]):
+                continue
+
+            results.append(data)
+    return results
+
+
+def load_nickname_overrides(file_path: str=NICKNAME_FILE_PATTERN):
+    """Loads the nickname overrides CSV as the {nickname: monster_no_na} MonsterIndex takes."""
+    return {x[0].lower(): int(x[1]) for x in csv_to_tuples(file_path) if x[1].isdigit()}
+
+
+def load_basename_overrides(file_path: str=BASENAME_FILE_PATTERN):
+    """Loads the basename overrides CSV as the {monster_no_na: basenames} MonsterIndex takes."""
+    basename_overrides_map = defaultdict(set)
+    for k, v in csv_to_tuples(file_path):
+        if k.isdigit():
+            basename_overrides_map[int(k)].add(v.lower())
+    return basename_overrides_map
+
+
+def load_historic_queries(file_path: str=HISTORIC_LOOKUPS_PATH):
+    """Loads the distinct historic ^id queries, normalized like find_monster does.
+
+    The file keeps the last result for each query, not how often it was looked up, so each
+    query appears once however popular it is.
+    """
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path, encoding='utf-8') as f:
+        return sorted({normalize_query(q) for q in json.load(f)})
+
+
+def empty_index():
+    return MonsterIndex(PgRawDatabase(skip_load=True), {}, {})
+
+
+def normalize_query(query: str):
+    """Normalizes a monster query the way MonsterIndex lookups expect."""
+    return rpadutils.rmdiacritics(query).lower().strip()
+
+
+class PrefixIndex(object):
+    """String keys kept sorted, so all the keys starting with a prefix are one bisect away."""
+    __slots__ = ('keys', 'values')
+
+    def __init__(self, items):
+        items = sorted(items, key=lambda item: item[0])
+        self.keys = [k for k, _ in items]
+        self.values = [v for _, v in items]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _prefix_range(self, prefix: str, lo: int=0):
+        start = bisect.bisect_left(self.keys, prefix, lo)
+        # U+10FFFF is the last code point, and a noncharacter, so no key continues past it
+        end = bisect.bisect_left(self.keys, prefix + '\U0010ffff', start)
+        return start, end
+
+    def keys_with_prefix(self, prefix: str):
+        start, end = self._prefix_range(prefix)
+        return self.keys[start:end]
+
+    def keys_with_prefixes(self, prefixes):
+        """Returns {prefix: keys_with_prefix(prefix)} for many prefixes, in one pass over the keys."""
+        results = {}
+        start = 0
+        for prefix in sorted(prefixes):
+            start, end = self._prefix_range(prefix, start)
+            results[prefix] = self.keys[start:end]
+        return results
+
+    def matches_for_prefixes(self, prefixes):
+        """Returns {prefix: matches(prefix)} for many prefixes, in one pass over the keys."""
+        results = {}
+        start = 0
+        for prefix in sorted(prefixes):
+            start, end = self._prefix_range(prefix, start)
+            results[prefix] = set(self.values[start:end])
+        return results
+
+    def matches(self, prefix: str):
+        """Returns the set of values whose key starts with prefix."""
+        start, end = self._prefix_range(prefix)
+        return set(self.values[start:end])
+
+    def exact_matches(self, key: str):
+        """Returns the set of values whose key is key."""
+        start = bisect.bisect_left(self.keys, key)
+        return set(self.values[start:bisect.bisect_right(self.keys, key, start)])
+
+
+class SubstringIndex(object):
+    """Trigram index over strings, for finding the values whose string contains a query."""
+    __slots__ = ('texts', 'values', 'ngrams')
+
+    NGRAM_SIZE = 3
+
+    def __init__(self, items):
+        self.texts = []
+        self.values = []
+        # ngram -> ascending positions in texts containing it
+        self.ngrams = defaultdict(list)
+        for text, value in items:
+            for ngram in self._ngrams(text):
+                self.ngrams[ngram].append(len(self.texts))
+            self.texts.append(text)
+            self.values.append(value)
+        self.ngrams = dict(self.ngrams)
+
+    @classmethod
+    def _ngrams(cls, text: str):
+        return {text[i:i + cls.NGRAM_SIZE] for i in range(len(text) - cls.NGRAM_SIZE + 1)}
+
+    def matches(self, query: str):
+        """Returns the set of values whose string contains query."""
+        if len(query) < self.NGRAM_SIZE:
+            # Too short to have an ngram; only short JP queries get here
+            candidates = range(len(self.texts))
+        else:
+            postings = [self.ngrams.get(ngram) for ngram in self._ngrams(query)]
+            if not all(postings):
+                return set()
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    return set()
+        # Having every ngram doesn't mean they're in order, so check the candidates
+        return {self.values[i] for i in candidates if query in self.texts[i]}
+
+
+class FuzzyIndex(object):
+    """Bigram index for finding close matches the way difflib.get_close_matches does.
+
+    For two strings of total length T to have a SequenceMatcher ratio of r, their matching
+    blocks cover r * T / 2 characters, and every block after the first needs an unmatched
+    character in front of it. So if they share B bigrams, r is at most 2 * (B + T + 1) / 3T.
+    Strings are compared best bound first, until the bound drops below the best ratio found
+    or the cutoff. The result is the same as comparing against every string.
+    """
+    __slots__ = ('buckets',)
+
+    def __init__(self, strings):
+        # length -> (strings of that length, bigram key -> positions of the strings in the
+        # bucket containing it)
+        self.buckets = {}
+        for text in strings:
+            bucket_strings, bigrams = self.buckets.setdefault(
+                len(text), ([], defaultdict(lambda: array.array('i'))))
+            idx = len(bucket_strings)
+            bucket_strings.append(text)
+            for key in self._bigram_keys(text):
+                bigrams[key].append(idx)
+        for bucket_strings, bigrams in self.buckets.values():
+            bigrams.default_factory = None
+
+    @staticmethod
+    def _bigram_keys(text: str):
+        """The bigrams of text; repeats are numbered, so shared keys count shared bigrams."""
+        keys = [text[i:i + 2] for i in range(len(text) - 1)]
+        if len(set(keys)) < len(keys):
+            counts = defaultdict(int)
+            for i, bigram in enumerate(keys):
+                counts[bigram] += 1
+                if counts[bigram] > 1:
+                    keys[i] = (bigram, counts[bigram])
+        return keys
+
+    def get_close_match(self, query: str, cutoff: float):
+        """Returns the string closest to query with a ratio of at least cutoff, or None."""
+        matches = self.get_close_matches(query, 1, cutoff)
+        return matches[0][1] if matches else None
+
+    def get_close_matches(self, query: str, n: int, cutoff: float):
+        """Returns up to n (ratio, string) pairs closest to query, best first."""
+        query_keys = self._bigram_keys(query)
+
+        # (bound on the ratio, string)
+        candidates = []
+        for length, (bucket_strings, bigrams) in self.buckets.items():
+            total = len(query) + length
+            # Same as SequenceMatcher.real_quick_ratio()
+            length_bound = 2 * min(len(query), length) / total
+            if length_bound < cutoff:
+                continue
+            # Fewest shared bigrams for the bound to reach the cutoff, slightly under so
+            # rounding can't drop a real match
+            min_shared = 1.5 * cutoff * total - total - 1 - 1e-9
+            if min_shared <= 0:
+                candidates.extend((length_bound, text) for text in bucket_strings)
+                continue
+            shared = collections.Counter()
+            for key in query_keys:
+                shared.update(bigrams.get(key, ()))
+            candidates.extend((min(length_bound, 2 * (count + total + 1) / (3 * total)),
+                               bucket_strings[idx])
+                              for idx, count in shared.items() if count >= min_shared)
+
+        # Same checks and tie breaking as difflib.get_close_matches; best holds the n
+        # best (ratio, string) pairs so far, worst first
+        best = []
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(query)
+        for bound, text in sorted(candidates, reverse=True):
+            if bound + 1e-9 < (best[0][0] if len(best) == n else cutoff):
+                break
+            matcher.set_seq1(text)
+            if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+                continue
+            ratio = matcher.ratio()
+            if ratio < cutoff:
+                continue
+            if len(best) < n:
+                heapq.heappush(best, (ratio, text))
+            elif (ratio, text) > best[0]:
+                heapq.heapreplace(best, (ratio, text))
+        return sorted(best, reverse=True)
+
+
+# The find_monster stages, best first
+MATCH_STAGES = ['id', 'exact_nickname', 'space_nickname', 'nickname', 'full_name', 'second_word',
+                'name_contains_nickname', 'name_contains', 'exact_reading', 'reading_prefix',
+                'close_nickname', 'close_name']
+MATCH_STAGE_SCORES = {stage: len(MATCH_STAGES) - i for i, stage in enumerate(MATCH_STAGES)}
+
+# score is (stage score, similarity, not low priority, rarity, monster_no_na); higher is better
+MonsterCandidate = collections.namedtuple('MonsterCandidate', ['score', 'monster', 'stage'])
+
+
+def monster_priority(nm):
+    """The part of a candidate score which picks between monsters matched the same way."""
+    return not nm.is_low_priority, nm.rarity, nm.monster_no_na
+
+
+class MonsterIndex(object):
+    def __init__(self, monster_database, nickname_overrides, basename_overrides, accept_filter=None):
+        # Important not to hold onto anything except IDs here so we don't leak memory
+        monster_groups = monster_database.grouped_monsters
+
+        self.load_profile = LoadProfile()
+        self.load_profile.begin_phase('named_monsters')
+
+        self.attr_short_prefix_map = {
+            Attribute.Fire: ['r'],
+            Attribute.Water: ['b'],
+            Attribute.Wood: ['g'],
+            Attribute.Light: ['l'],
+            Attribute.Dark: ['d'],
+        }
+        self.attr_long_prefix_map = {
+            Attribute.Fire: ['red', 'fire'],
+            Attribute.Water: ['blue', 'water'],
+            Attribute.Wood: ['green', 'wood'],
+            Attribute.Light: ['light'],
+            Attribute.Dark: ['dark'],
+        }
+
+        self.series_to_prefix_map = {
+            130: ['halloween', 'hw', 'h'],
+            136: ['xmas', 'christmas'],
+            125: ['summer', 'beach'],
+            114: ['school', 'academy', 'gakuen'],
+            139: ['new years', 'ny'],
+            149: ['wedding', 'bride'],
+            154: ['padr'],
+            175: ['valentines', 'vday'],
+        }
+
+        monster_no_na_to_nicknames = defaultdict(set)
+        for nickname, monster_no_na in nickname_overrides.items():
+            monster_no_na_to_nicknames[monster_no_na].add(nickname)
+
+        # Most monsters have one of a few prefix sets; they share a single frozenset each
+        shared_prefixes = {}
+
+        named_monsters = []
+        for mg in monster_groups:
+            group_basename_overrides = basename_overrides.get(mg.base_monster.monster_no_na, [])
+            named_mg = NamedMonsterGroup(mg, group_basename_overrides)
+            for monster in mg.members:
+                if accept_filter and not accept_filter(monster):
+                    continue
+                prefixes = frozenset(self.compute_prefixes(monster, mg))
+                prefixes = shared_prefixes.setdefault(prefixes, prefixes)
+                extra_nicknames = monster_no_na_to_nicknames.get(monster.monster_no_na, frozenset())
+                named_monster = NamedMonster(monster, named_mg, prefixes, extra_nicknames)
+                named_monsters.append(named_monster)
+
+        # Sort the NamedMonsters into the opposite order we want to accept their nicknames in
+        # This order is:
+        #  1) High priority first
+        #  2) Larger group sizes
+        #  3) Minimum ID size in the group
+        #  4) Monsters with higher ID values
+        def named_monsters_sort(nm: NamedMonster):
+            return (not nm.is_low_priority, nm.group_size, -1 *
+                    nm.base_monster_no_na, nm.monster_no_na)
+        self.load_profile.begin_phase('sort')
+        named_monsters.sort(key=named_monsters_sort)
+
+        self.nickname_overrides = nickname_overrides
+        self._init_lookup_maps(named_monsters)
+
+        # The search indexes below cover every named monster and nickname; lookups mask out
+        # the entries this index (or a FilteredMonsterIndex view of it) doesn't have
+        self.load_profile.begin_phase('prefix_indexes')
+        self.nickname_prefixes = PrefixIndex(self.all_entries.items())
+        self.name_prefixes = PrefixIndex(
+            [(nm.name_na.lower(), nm) for nm in named_monsters] +
+            [(nm.name_jp.lower(), nm) for nm in named_monsters])
+
+        self.load_profile.begin_phase('substring_index')
+        self.name_substrings = SubstringIndex(
+            [(nm.name_na.lower(), nm) for nm in named_monsters] +
+            [(nm.name_jp.lower(), nm) for nm in named_monsters])
+
+        self.load_profile.begin_phase('reading_index')
+        self.name_readings = PrefixIndex(
+            (key, nm) for nm in named_monsters for key in name_reading_keys(nm.name_jp))
+
+        self.load_profile.begin_phase('fuzzy_indexes')
+        self.nickname_fuzzy = FuzzyIndex(self.all_entries.keys())
+        self.name_fuzzy = FuzzyIndex(self.all_na_name_to_monsters.keys())
+
+        self.load_profile.end_phase()
+        self.load_profile.counts.update({
+            'monster_groups': len(monster_groups),
+            'named_monsters': len(named_monsters),
+            'nickname_entries': len(self.all_entries),
+            'two_word_entries': len(self.two_word_entries),
+            'name_prefix_entries': len(self.name_prefixes),
+            'name_ngrams': len(self.name_substrings.ngrams),
+            'name_reading_entries': len(self.name_readings),
+        })
+
+    def _init_lookup_maps(self, named_monsters):
+        """Builds the nickname and number maps from named_monsters, in acceptance order."""
+        self.load_profile.begin_phase('nickname_entries')
+        self.all_entries = {}
+        self.two_word_entries = {}
+        for nm in named_monsters:
+            for nickname in nm.final_nicknames:
+                self.all_entries[nickname] = nm
+            for nickname in nm.final_two_word_nicknames:
+                self.two_word_entries[nickname] = nm
+
+        self.load_profile.begin_phase('lookup_maps')
+        self.all_monsters = named_monsters
+        self.all_na_name_to_monsters = {m.name_na.lower(): m for m in named_monsters}
+        self.monster_no_na_to_named_monster = {m.monster_no_na: m for m in named_monsters}
+        self.monster_no_to_named_monster = {m.monster_no: m for m in named_monsters}
+
+        for nickname, monster_no_na in self.nickname_overrides.items():
+            nm = self.monster_no_na_to_named_monster.get(monster_no_na)
+            if nm:
+                self.all_entries[nickname] = nm
+
+        self.named_monster_set = set(named_monsters)
+        # Some full name stages only consider monsters which have a nickname
+        self.entry_monsters = set(self.all_entries.values())
+
+    def init_index(self):
+        pass
+
+    def compute_prefixes(self, m: PgMonster, mg: MonsterGroup):
+        prefixes = set()
+
+        attr1_short_prefixes = self.attr_short_prefix_map[m.attr1]
+        attr1_long_prefixes = self.attr_long_prefix_map[m.attr1]
+        prefixes.update(attr1_short_prefixes)
+        prefixes.update(attr1_long_prefixes)
+
+        # If no 2nd attribute, use x so we can look those monsters up easier
+        attr2_short_prefixes = self.attr_short_prefix_map.get(m.attr2, ['x'])
+        for a1 in attr1_short_prefixes:
+            for a2 in attr2_short_prefixes:
+                prefixes.add(a1 + a2)
+                prefixes.add(a1 + '/' + a2)
+
+        # TODO: add prefixes based on type
+
+        # Chibi monsters have the same NA name, except lowercased
+        if m.name_na != m.name_jp:
+            if m.name_na.lower() == m.name_na:
+                prefixes.add('chibi')
+        elif 'ミニ' in m.name_jp:
+            # Guarding this separately to prevent 'gemini' from triggering (e.g. 2645)
+            prefixes.add('chibi')
+
+        lower_name = m.name_na.lower()
+        awoken = lower_name.startswith('awoken') or '覚醒' in lower_name
+        revo = lower_name.startswith('reincarnated') or '転生' in lower_name
+        mega = lower_name.startswith('mega woken') or '極醒' in lower_name
+        awoken_or_revo_or_equip_or_mega = awoken or revo or m.is_equip or mega
+
+        # These clauses need to be separate to handle things like 'Awoken Thoth' which are
+        # actually Evos but have awoken in the name
+        if awoken:
+            prefixes.add('a')
+            prefixes.add('awoken')
+
+        if revo:
+            prefixes.add('revo')
+            prefixes.add('reincarnated')
+
+        if mega:
+            prefixes.add('mega')
+            prefixes.add('mega awoken')
+            prefixes.add('awoken')
+
+        # Prefixes for evo type
+        if m.cur_evo_type == EvoType.Base:
+            prefixes.add('base')
+        elif m.cur_evo_type == EvoType.Evo:
+            prefixes.add('evo')
+        elif m.cur_evo_type == EvoType.UvoAwoken and not awoken_or_revo_or_equip_or_mega:
+            prefixes.add('uvo')
+            prefixes.add('uevo')
+        elif m.cur_evo_type == EvoType.UuvoReincarnated and not awoken_or_revo_or_equip_or_mega:
+            prefixes.add('uuvo')
+            prefixes.add('uuevo')
+
+        # If any monster in the group is a pixel, add 'nonpixel' to all the versions
+        # without pixel in the name. Add 'pixel' as a prefix to the ones with pixel in the name.
+        def is_pixel(n):
+            n = n.name_na.lower()
+            return n.startswith('pixel') or n.startswith('ドット')
+
+        for gm in mg.members:
+            if is_pixel(gm):
+                prefixes.update(['pixel'] if is_pixel(m) else ['np', 'nonpixel'])
+                break
+
+        if m.is_equip:
+            prefixes.add('assist')
+            prefixes.add('equip')
+
+        # Collab prefixes
+        prefixes.update(self.series_to_prefix_map.get(m.series.tsr_seq, []))
+
+        return prefixes
+
+    def find_monster(self, query):
+        nm, err, debug_info, _ = self._find_monster(normalize_query(query))
+        return nm, err, debug_info
+
+    def find_monster_stage(self, query):
+        """The step of the find_monster cascade which resolves query.
+
+        One of MATCH_STAGES, 'too_short' or 'no_match'.
+        """
+        return self._find_monster(normalize_query(query))[3]
+
+    def find_monsters(self, queries):
+        """Resolves a batch of queries, with the same results as find_monster on each.
+
+        Duplicate queries are only resolved once, and each prefix stage runs for the whole
+        batch in one pass over its sorted keys. Returns a list of (nm, err, debug_info, stage)
+        in the order of queries, where stage names the step of the find_monster cascade
+        which produced the result (see find_monster_stage), and a dict of stage -> number of
+        unique queries it resolved.
+        """
+        normalized = {q: normalize_query(q) for q in set(queries)}
+        results = {}
+        pending = []
+        for query in set(normalized.values()):
+            if query.isdigit() or query in self.all_entries or self._length_error(query):
+                results[query] = self._find_monster(query)
+            else:
+                pending.append(query)
+
+        for stage, batch_matches in self._batch_prefix_stages():
+            matches_by_query = batch_matches(pending)
+            remaining = []
+            for query in pending:
+                matches = matches_by_query[query]
+                if matches:
+                    results[query] = self._prefix_stage_result(stage, matches)
+                else:
+                    remaining.append(query)
+            pending = remaining
+
+        for query in pending:
+            results[query] = self._find_monster(query, (None, set()))
+
+        stage_counts = defaultdict(int)
+        for result in results.values():
+            stage_counts[result[3]] += 1
+        return [results[normalized[q]] for q in queries], dict(stage_counts)
+
+    @staticmethod
+    def _length_error(query: str):
+        contains_jp = rpadutils.containsJp(query)
+        if len(query) < 2 and contains_jp:
+            return 'Japanese queries must be at least 2 characters'
+        elif len(query) < 4 and not contains_jp:
+            return 'Your query must be at least 4 letters'
+        return None
+
+    def _find_monster(self, query, prefix_result=None):
+        """Runs the find_monster cascade for a normalized query.
+
+        prefix_result is the result of prefix_matches(query), if it was already computed.
+        Returns (nm, err, debug_info, stage).
+        """
+        # id search
+        if query.isdigit():
+            m = self.monster_no_na_to_named_monster.get(int(query))
+            if m is None:
+                return None, 'Looks like a monster ID but was not found', None, 'id'
+            else:
+                return m, None, "ID lookup", 'id'
+            # special handling for na/jp
+
+        # TODO: need to handle na_only?
+
+        # handle exact nickname match
+        if query in self.all_entries:
+            return self.all_entries[query], None, "Exact nickname", 'exact_nickname'
+
+        err = self._length_error(query)
+        if err:
+            return None, err, None, 'too_short'
+
+        stage, matches = prefix_result or self.prefix_matches(query)
+        if stage:
+            return self._prefix_stage_result(stage, matches)
+
+        # for nicknames with 2 names, prefix search 2nd word, take max id
+        if query in self.two_word_entries:
+            return self.two_word_entries[query], None, "Second-word nickname prefix, max of {}".format(len(matches)), 'second_word'
+
+        # TODO: refactor 2nd search characteristcs for 2nd word
+
+        # full name contains on nickname, take max id
+        name_matches = self.name_substrings.matches(query)
+        matches = name_matches & self.entry_monsters
+        if len(matches):
+            return self.pickBestMonster(matches), None, 'Full name match on nickname, max of {}'.format(len(matches)), 'name_contains_nickname'
+
+        # full name contains on full monster list, take max id
+        matches = name_matches & self.named_monster_set
+        if len(matches):
+            return self.pickBestMonster(matches), None, 'Full name match on full list, max of {}'.format(len(matches)), 'name_contains'
+
+        # kana or romaji spelling of the JP name, exact then prefix
+        reading = reading_key(query)
+        if reading:
+            matches = self.name_readings.exact_matches(reading) & self.named_monster_set
+            if len(matches):
+                return self.pickBestMonster(matches), None, 'JP name reading ({}), max of {}'.format(reading, len(matches)), 'exact_reading'
+            matches = self.name_readings.matches(reading) & self.named_monster_set
+            if len(matches):
+                return self.pickBestMonster(matches), None, 'JP name reading prefix ({}), max of {}'.format(reading, len(matches)), 'reading_prefix'
+
+        # No decent matches. Try near hits on nickname instead
+        match = self.nickname_fuzzy.get_close_match(query, .8)
+        if match is not None:
+            return self.all_entries[match], None, 'Close nickname match ({})'.format(match), 'close_nickname'
+
+        # Still no decent matches. Try near hits on full name instead
+        match = self.name_fuzzy.get_close_match(query, .9)
+        if match is not None:
+            return self.all_na_name_to_monsters[match], None, 'Close name match ({})'.format(match), 'close_name'
+
+        # couldn't find anything
+        return None, "Could not find a match for: " + query, None, 'no_match'
+
+    def prefix_matches(self, query: str):
+        """Runs the prefix stages of find_monster, stopping at the first one which matches.
+
+        Returns the name of the stage and the set of matching NamedMonsters, or
+        (None, empty set) if no stage matched.
+        """
+        # prefix search for nicknames, space-preceeded
+        matches = self._nickname_prefix_matches(query + ' ')
+        if matches:
+            return 'space_nickname', matches
+
+        # prefix search for nicknames
+        matches = self._nickname_prefix_matches(query)
+        if matches:
+            return 'nickname', matches
+
+        # prefix search for full name
+        matches = self.name_prefixes.matches(query) & self.entry_monsters
+        if matches:
+            return 'full_name', matches
+        return None, matches
+
+    def _nickname_prefix_matches(self, prefix: str):
+        return {self.all_entries[k] for k in self.nickname_prefixes.keys_with_prefix(prefix)
+                if k in self.all_entries}
+
+    def _batch_prefix_stages(self):
+        """The stages of prefix_matches, as functions from queries to {query: matches}."""
+        def nickname_matches(keys):
+            return {self.all_entries[k] for k in keys if k in self.all_entries}
+
+        def space_nickname(queries):
+            keys = self.nickname_prefixes.keys_with_prefixes([q + ' ' for q in queries])
+            return {q: nickname_matches(keys[q + ' ']) for q in queries}
+
+        def nickname(queries):
+            keys = self.nickname_prefixes.keys_with_prefixes(queries)
+            return {q: nickname_matches(keys[q]) for q in queries}
+
+        def full_name(queries):
+            matches = self.name_prefixes.matches_for_prefixes(queries)
+            return {q: matches[q] & self.entry_monsters for q in queries}
+
+        return [('space_nickname', space_nickname), ('nickname', nickname),
+                ('full_name', full_name)]
+
+    def _prefix_stage_result(self, stage: str, matches):
+        """The find_monster result for matches found by a prefix stage."""
+        if stage == 'space_nickname':
+            return self.pickBestMonster(matches), None, "Space nickname prefix, max of {}".format(len(matches)), stage
+        elif stage == 'nickname':
+            all_names = ",".join(map(lambda x: x.name_na, matches))
+            return self.pickBestMonster(matches), None, "Nickname prefix, max of {}, matches=({})".format(len(matches), all_names), stage
+        else:
+            return self.pickBestMonster(matches), None, "Full name, max of {}".format(len(matches)), stage
+
+    def find_candidates(self, query: str, k: int=5):
+        """Returns up to k MonsterCandidates for query, best first.
+
+        Candidates come from the find_monster stages in order, so the first is the monster
+        find_monster picks, except that equally close fuzzy matches are ranked by monster
+        priority. Each stage only keeps its best few matches in a bounded heap, and the
+        remaining stages are skipped once k candidates are found.
+        """
+        candidates = []
+        seen = set()
+        for stage, matches in self._candidate_stages(normalize_query(query), k):
+            stage_score = (MATCH_STAGE_SCORES[stage],)
+            scored = (MonsterCandidate(stage_score + (similarity,) + monster_priority(nm), nm, stage)
+                      for similarity, nm in matches if nm not in seen)
+            for candidate in heapq.nlargest(k - len(candidates), scored, key=itemgetter(0)):
+                candidates.append(candidate)
+                seen.add(candidate.monster)
+            if len(candidates) == k:
+                break
+        return candidates
+
+    def _candidate_stages(self, query: str, k: int):
+        """Yields (stage, (similarity, nm) pairs) for each find_monster stage with matches."""
+        def exact(nm):
+            return [(1.0, nm)]
+
+        def each(matches):
+            return ((1.0, nm) for nm in matches)
+
+        def close(fuzzy_index, cutoff, entries):
+            # Several strings can name the same monster; keep the closest
+            found = collections.OrderedDict()
+            for ratio, text in fuzzy_index.get_close_matches(query, k, cutoff):
+                found.setdefault(entries[text], ratio)
+            return [(ratio, nm) for nm, ratio in found.items()]
+
+        if query.isdigit():
+            m = self.monster_no_na_to_named_monster.get(int(query))
+            if m is not None:
+                yield 'id', exact(m)
+            return
+
+        if query in self.all_entries:
+            yield 'exact_nickname', exact(self.all_entries[query])
+        if self._length_error(query):
+            return
+
+        yield 'space_nickname', each(self._nickname_prefix_matches(query + ' '))
+        yield 'nickname', each(self._nickname_prefix_matches(query))
+        yield 'full_name', each(self.name_prefixes.matches(query) & self.entry_monsters)
+        if query in self.two_word_entries:
+            yield 'second_word', exact(self.two_word_entries[query])
+
+        name_matches = self.name_substrings.matches(query)
+        yield 'name_contains_nickname', each(name_matches & self.entry_monsters)
+        yield 'name_contains', each(name_matches & self.named_monster_set)
+
+        reading = reading_key(query)
+        if reading:
+            yield 'exact_reading', each(self.name_readings.exact_matches(reading) & self.named_monster_set)
+            yield 'reading_prefix', each(self.name_readings.matches(reading) & self.named_monster_set)
+
+        yield 'close_nickname', close(self.nickname_fuzzy, .8, self.all_entries)
+        yield 'close_name', close(self.name_fuzzy, .9, self.all_na_name_to_monsters)
+
+    def pickBestMonster(self, named_monster_list):
+        return max(named_monster_list, key=monster_priority)
+
+
+class FilteredMonsterIndex(MonsterIndex):
+    """A view of a MonsterIndex limited to the monsters accepted by a filter.
+
+    NamedMonsters don't depend on the filter, so the view reuses the ones in the base index
+    along with its prefix and substring indexes, and only builds its own nickname maps and
+    fuzzy indexes. Lookups give the same results as a MonsterIndex built with the same
+    accept_filter.
+    """
+
+    def __init__(self, base_index: MonsterIndex, monster_database, accept_filter):
+        self.load_profile = LoadProfile()
+        self.load_profile.begin_phase('filter')
+        named_monsters = [nm for nm in base_index.all_monsters
+                          if accept_filter(monster_database.getMonster(nm.monster_no))]
+
+        self.nickname_overrides = base_index.nickname_overrides
+        self._init_lookup_maps(named_monsters)
+
+        self.nickname_prefixes = base_index.nickname_prefixes
+        self.name_prefixes = base_index.name_prefixes
+        self.name_substrings = base_index.name_substrings
+        self.name_readings = base_index.name_readings
+
+        # The fuzzy stages count bigrams and rank every string sharing one with the query, so
+        # sharing the base index's would make each lookup do that work for monsters the view
+        # then rejects
+        self.load_profile.begin_phase('fuzzy_indexes')
+        self.nickname_fuzzy = FuzzyIndex(self.all_entries.keys())
+        self.name_fuzzy = FuzzyIndex(self.all_na_name_to_monsters.keys())
+
+        self.load_profile.end_phase()
+        self.load_profile.counts.update({
+            'named_monsters': len(named_monsters),
+            'nickname_entries': len(self.all_entries),
+            'two_word_entries': len(self.two_word_entries),
+        })
+
+
+class NamedMonsterGroup(object):
+    def __init__(self, monster_group: MonsterGroup, basename_overrides: list):
+        self.is_low_priority = (
+            self._is_low_priority_monster(monster_group.base_monster)
+            or self._is_low_priority_group(monster_group))
+
+        monsters = monster_group.members
+        self.group_size = len(monsters)
+        self.base_monster_no = monster_group.base_monster.monster_no
+        self.base_monster_no_na = monster_group.base_monster.monster_no_na
+
+        self.monster_no_to_basename = {
+            m.monster_no: self._compute_monster_basename(m) for m in monsters
+        }
+
+        self.computed_basename = self._compute_group_basename(monsters)
+        self.computed_basenames = set([self.computed_basename])
+        if '-' in self.computed_basename:
+            self.computed_basenames.add(self.computed_basename.replace('-', ' '))
+
+        self.basenames = basename_overrides or self.computed_basenames
+
+        # Compute extra basenames by checking for two-word basenames and using the second half
+        self.two_word_basenames = set()
+        for basename in self.basenames:
+            basename_words = basename.split(' ')
+            if len(basename_words) == 2:
+                self.two_word_basenames.add(basename_words[1])
+
+    def _compute_monster_basename(self, m: PgMonster):
+        basename = m.name_na.lower()
+        if ',' in basename:
+            name_parts = basename.split(',')
+            if name_parts[1].strip().startswith('the '):
+                # handle names like 'xxx, the yyy' where xxx is the name
+                basename = name_parts[0]
+            else:
+                # otherwise, grab the chunk after the last comma
+                basename = name_parts[-1]
+
+        for x in ['awoken', 'reincarnated']:
+            if basename.startswith(x):
+                basename = basename.replace(x, '')
+
+        # Fix for DC collab garbage
+        basename = basename.replace('(comics)', '')
+        basename = basename.replace('(film)', '')
+
+        return basename.strip()
+
+    def _compute_group_basename(self, monsters):
+        """Computes the basename for a group of monsters.
+
+        Prefer a basename with the largest count across the group. If all the
+        groups have equal size, prefer the lowest monster number basename.
+        This monster in general has better names, particularly when all the
+        names are unique, e.g. for male/female hunters."""
+        def count_and_id(): return [0, 0]
+        basename_to_info = defaultdict(count_and_id)
+
+        for m in monsters:
+            basename = self.monster_no_to_basename[m.monster_no]
+            entry = basename_to_info[basename]
+            entry[0] += 1
+            entry[1] = max(entry[1], m.monster_no)
+
+        entries = [[count_id[0], -1 * count_id[1], bn] for bn, count_id in basename_to_info.items()]
+        return max(entries)[2]
+
+    def _is_low_priority_monster(self, m: PgMonster):
+        lp_types = ['evolve', 'enhance', 'protected', 'awoken', 'vendor']
+        lp_substrings = ['tamadra']
+        lp_min_rarity = 2
+        name = m.name_na.lower()
+
+        failed_type = m.type1.lower() in lp_types
+        failed_ss = any([x in name for x in lp_substrings])
+        failed_rarity = m.rarity < lp_min_rarity
+        failed_chibi = name == m.name_na and m.name_na != m.name_jp
+        failed_equip = m.is_equip
+        return failed_type or failed_ss or failed_rarity or failed_chibi or failed_equip
+
+    def _is_low_priority_group(self, mg: MonsterGroup):
+        lp_grp_min_rarity = 5
+        max_rarity = max(m.rarity for m in mg.members)
+        failed_max_rarity = max_rarity < lp_grp_min_rarity
+        return failed_max_rarity
+
+
+class NamedMonster(object):
+    """A monster with the data needed to look it up by nickname.
+
+    There are thousands of these per index, so the nicknames aren't stored; final_nicknames
+    and final_two_word_nicknames generate them from the prefixes and basenames, which are
+    shared with the rest of the group (and for prefixes, with other monsters).
+    """
+
+    __slots__ = ('monster_no', 'monster_no_na', 'monster_no_jp', 'base_monster_no',
+                 'base_monster_no_na', 'group_basenames', 'two_word_basenames', 'prefixes',
+                 'roma_subname', 'is_low_priority', 'group_size', 'rarity', 'name_na', 'name_jp',
+                 'monster_basename', 'group_computed_basename', 'extra_nicknames')
+
+    def __init__(self, monster: PgMonster, monster_group: NamedMonsterGroup, prefixes: frozenset, extra_nicknames: set):
+        # Must not hold onto monster or monster_group!
+
+        # Hold on to the IDs instead
+        self.monster_no = monster.monster_no
+        self.monster_no_na = monster.monster_no_na
+        self.monster_no_jp = monster.monster_no_jp
+
+        # ID of the root of the tree for this monster
+        self.base_monster_no = monster_group.base_monster_no
+        self.base_monster_no_na = monster_group.base_monster_no_na
+
+        # This stuff is important for nickname generation
+        self.group_basenames = monster_group.basenames
+        self.two_word_basenames = monster_group.two_word_basenames
+        self.prefixes = prefixes
+        self.roma_subname = monster.roma_subname
+
+        # Data used to determine how to rank the nicknames
+        self.is_low_priority = monster_group.is_low_priority or monster.is_equip
+        self.group_size = monster_group.group_size
+        self.rarity = monster.rarity
+
+        # Used in fallback searches
+        self.name_na = monster.name_na
+        self.name_jp = monster.name_jp
+
+        # These are just extra metadata
+        self.monster_basename = monster_group.monster_no_to_basename[self.monster_no]
+        self.group_computed_basename = monster_group.computed_basename
+        self.extra_nicknames = extra_nicknames
+
+        # Compute any extra prefixes
+        if self.monster_basename in ('ana', 'ace'):
+            self.prefixes = self.prefixes | {self.monster_basename}
+
+    @property
+    def final_nicknames(self):
+        """The primary result nicknames."""
+        # Set the configured override nicknames
+        nicknames = set(self.extra_nicknames)
+        # Set the roma subname for JP monsters
+        if self.roma_subname:
+            nicknames.add(self.roma_subname)
+        # For each basename, add nicknames
+        nicknames.update(self._prefixed_nicknames(self.group_basenames))
+        return nicknames
+
+    @property
+    def final_two_word_nicknames(self):
+        # Slightly different process for two-word basenames. Does this make sense? Who knows.
+        return set(self._prefixed_nicknames(self.two_word_basenames))
+
+    def _prefixed_nicknames(self, basenames):
+        # Interned, so the indexes built from the same monsters share one copy of each string
+        for basename in basenames:
+            # Add the basename directly
+            yield sys.intern(basename)
+            # Add the prefix plus basename, and the prefix with a space between basename
+            for prefix in self.prefixes:
+                yield sys.intern(prefix + basename)
+                yield sys.intern(prefix + ' ' + basename)
+
+
+def compute_killers(*types):
+    if 'Balance' in types:
+        return ['Any']
+    killers = set()
+    for t in types:
+        killers.update(type_to_killers_map.get(t, []))
+    return sorted(killers)
+
+
+type_to_killers_map = {
+    'God': ['Devil'],
+    'Devil': ['God'],
+    'Machine': ['God', 'Balance'],
+    'Dragon': ['Machine', 'Healer'],
+    'Physical': ['Machine', 'Healer'],
+    'Attacker': ['Devil', 'Physical'],
+    'Healer': ['Dragon', 'Attacker'],
+}
+
+
+def setup(bot):
+    # Nothing to add to the bot; this is only installed as a cog so padguide2 can import it
+    print('padguide2core setup')
@@ -46,6 +46,9 @@ submit an override suggestion: https://docs.google.com/forms/d/1kJH9Q0S8iqqULwrR
 
 EMBED_NOT_GENERATED = -1
 
+# Number of find_monster results remembered between index refreshes
+FIND_MONSTER_CACHE_SIZE = 2000
+
 
 INFO_PDX_TEMPLATE = 'http://www.puzzledragonx.com/en/monster.asp?n={}'
 RPAD_PIC_TEMPLATE = 'https://f002.backblazeb2.com/file/miru-data/padimages/{}/full/{}.png'
@@ -83,6 +86,9 @@ class PadInfo:
 
         self.index_all = padguide2.empty_index()
         self.index_na = padguide2.empty_index()
+        # Incremented whenever refresh_index installs new indexes
+        self.index_generation = 0
+        self.find_cache = FindMonsterCache()
 
         self.menu = Menu(bot)
 
@@ -109,6 +115,7 @@ class PadInfo:
         # Manually nulling out database because the GC for cogs seems to be pretty shitty
         self.index_all = padguide2.empty_index()
         self.index_na = padguide2.empty_index()
+        self.find_cache.clear()
         self.historic_lookups = {}
 
     async def reload_nicknames(self):
@@ -126,9 +133,12 @@ class PadInfo:
     async def refresh_index(self):
         """Refresh the monster indexes."""
         pg_cog = self.bot.get_cog('PadGuide2')
-        await pg_cog.wait_until_ready()
+        # The index only needs monsters and their evolution trees
+        await pg_cog.wait_until_ready(padguide2.TIER_EVOLUTIONS)
         self.index_all = pg_cog.create_index()
-        self.index_na = pg_cog.create_index(lambda m: m.on_na)
+        self.index_na = pg_cog.create_filtered_index(self.index_all, lambda m: m.on_na)
+        self.index_generation += 1
+        self.find_cache.clear()
 
     def get_monster_by_no(self, monster_no: int):
         pg_cog = self.bot.get_cog('PadGuide2')
@@ -423,8 +433,26 @@ class PadInfo:
         return m, err, debug_info
 
     def _findMonster(self, query, na_only=False):
-        monster_index = self.index_na if na_only else self.index_all
-        return monster_index.find_monster(query)
+        # Same normalization as find_monster, so equivalent queries share an entry
+        key = (self.index_generation, na_only, padguide2.normalize_query(query))
+        result = self.find_cache.get(key)
+        if result is None:
+            monster_index = self.index_na if na_only else self.index_all
+            result = monster_index.find_monster(query)
+            self.find_cache.put(key, result)
+        return result
+
+    @padinfo.command(pass_context=True)
+    @checks.is_owner()
+    async def cachestats(self, ctx):
+        """Print the hit rate of the monster lookup cache."""
+        cache = self.find_cache
+        lookups = cache.hits + cache.misses
+        msg = 'index generation: {}\n'.format(self.index_generation)
+        msg += 'cached results: {} of {}\n'.format(len(cache), cache.max_size)
+        msg += 'hits: {}\nmisses: {}\n'.format(cache.hits, cache.misses)
+        msg += 'hit rate: {:.1%}'.format(cache.hits / lookups if lookups else 0)
+        await self.bot.say(box(msg))
 
     def map_awakenings_text(self, m):
         """Exported for use in other cogs"""
@@ -488,6 +516,41 @@ class PadInfoSettings(CogSettings):
         self.save_settings()
 
 
+class FindMonsterCache(object):
+    """Bounded LRU cache of find_monster results.
+
+    Keys include the index generation, so results never outlive the index they came from;
+    clear() drops them early when a new index is installed. The hit and miss counters
+    cover the lifetime of the cog.
+    """
+
+    def __init__(self, max_size=FIND_MONSTER_CACHE_SIZE):
+        self.max_size = max_size
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.results)
+
+    def get(self, key):
+        result = self.results.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.results.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self.results[key] = result
+        if len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+
+    def clear(self):
+        self.results.clear()
+
+
 def monsterToHeader(m: padguide2.PgMonster, link=False):
     msg = 'No. {} {}'.format(m.monster_no_na, m.name_na)
     return '[{}]({})'.format(msg, get_pdx_url(m)) if link else msg
@@ -34,7 +34,7 @@ class PadMonitor:
     async def check_seen(self):
         """Refresh the monster indexes."""
         pg_cog = self.bot.get_cog('PadGuide2')
-        await pg_cog.wait_until_ready()
+        await pg_cog.wait_until_ready(padguide2.TIER_MONSTERS)
         all_monsters = pg_cog.database.all_monsters()
         jp_monster_map = {m.monster_no: m for m in all_monsters}
         na_monster_map = {m.monster_no: m for m in all_monsters if m.on_na}
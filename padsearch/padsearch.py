@@ -704,7 +704,8 @@ class PadSearch:
             await self.bot.say(box('No match: ' + err))
             return
 
-        await self.bot.say(box(json.dumps(m.search, indent=2, default=lambda o: o.__dict__)))
+        await self.bot.say(box(json.dumps(
+            m.search, indent=2, default=lambda o: {k: getattr(o, k) for k in o.__slots__})))
 
 
 def setup(bot):
@@ -194,15 +194,45 @@ async def async_cached_padguide_request(client_session, endpoint, result_file, t
     writeJsonFile(result_file, resp)
 
 
+PADGUIDE_STORAGE_URL = 'https://f002.backblazeb2.com/file/miru-data/paddata/padguide/{}.json'
+
+
 @backoff.on_exception(backoff.expo, aiohttp.ClientError, max_time=60)
 @backoff.on_exception(backoff.expo, aiohttp.DisconnectedError, max_time=60)
 async def async_padguide_ts_request(client_session, time_ms, endpoint):
-    STORAGE_URL = 'https://f002.backblazeb2.com/file/miru-data/paddata/padguide/{}.json'
-    url = STORAGE_URL.format(endpoint)
+    url = PADGUIDE_STORAGE_URL.format(endpoint)
     async with client_session.get(url) as resp:
         return await resp.json()
 
 
+@backoff.on_exception(backoff.expo, aiohttp.ClientError, max_time=60)
+@backoff.on_exception(backoff.expo, aiohttp.DisconnectedError, max_time=60)
+async def async_conditional_padguide_request(client_session, endpoint, result_file, validators):
+    """Revalidate a PadGuide file against the storage bucket, downloading it if it changed.
+
+    The validators dict holds the ETag/Last-Modified from the previous download of this
+    endpoint, and is updated in place after a download.
+    Returns True if result_file was rewritten, False if the server responded 304.
+    """
+    headers = {}
+    if os.path.exists(result_file):
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+    url = PADGUIDE_STORAGE_URL.format(endpoint)
+    async with client_session.get(url, headers=headers) as resp:
+        if resp.status == 304:
+            return False
+        js_data = await resp.json()
+        validators['etag'] = resp.headers.get('ETag')
+        validators['last_modified'] = resp.headers.get('Last-Modified')
+
+    writeJsonFile(result_file, js_data)
+    return True
+
+
 def writePlainFile(file_path, text_data):
     with open(file_path, "wt", encoding='utf-8') as f:
         f.write(text_data)
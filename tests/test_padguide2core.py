@@ -0,0 +1,99 @@
+"""
+Tests for the PadGuide database and monster index in padguide2core.
+
+Like the benchmarks, these import padguide2core from the cogs package, so run them from the
+bot directory with the cogs installed:
+
+    PYTHONPATH=. python -m unittest discover -s path/to/tests
+"""
+from datetime import datetime
+from datetime import timedelta
+import types
+import unittest
+from unittest import mock
+
+import pytz
+
+from cogs import padguide2core
+
+
+def at(when: datetime):
+    """Patches the time seen by padguide2core to when, a UTC datetime."""
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return when.astimezone(tz) if tz else when.replace(tzinfo=None)
+
+    return mock.patch.object(padguide2core, 'datetime', FrozenDatetime)
+
+
+class SkillRotationIndexTest(unittest.TestCase):
+    START = datetime(2018, 6, 1, 12, tzinfo=pytz.UTC)
+
+    def make_rotations(self):
+        """One NA monster which rotates from skill 1 to skill 2 on the 11th day."""
+        monster = types.SimpleNamespace(monster_no=100, server_actives={},
+                                        future_skillup_rotation={})
+        skills = [types.SimpleNamespace(ts_seq=ts_seq, server_skillups={}) for ts_seq in (1, 2)]
+        skill_rotation = types.SimpleNamespace(server='NA', monster_no=monster.monster_no,
+                                               monster=monster)
+        rotations = [
+            types.SimpleNamespace(skill_rotation=skill_rotation, skill=skill,
+                                  rotation_date=self.START.date() + timedelta(days=days))
+            for skill, days in zip(skills, (0, 10))
+        ]
+        return monster, skills, rotations
+
+    def test_advance_across_rotation_matches_rebuild(self):
+        later = self.START + timedelta(days=15)
+
+        monster, skills, rotations = self.make_rotations()
+        with at(self.START):
+            index = padguide2core.SkillRotationIndex(rotations)
+        self.assertIs(skills[0].server_skillups['NA'], monster)
+        with at(later):
+            index.advance()
+
+        rebuilt_monster, rebuilt_skills, rebuilt_rotations = self.make_rotations()
+        with at(later):
+            padguide2core.SkillRotationIndex(rebuilt_rotations)
+
+        self.assertEqual(monster.server_actives['NA'].ts_seq,
+                         rebuilt_monster.server_actives['NA'].ts_seq)
+        self.assertEqual(monster.future_skillup_rotation, rebuilt_monster.future_skillup_rotation)
+        for skill, rebuilt_skill in zip(skills, rebuilt_skills):
+            self.assertEqual(
+                {server: m.monster_no for server, m in skill.server_skillups.items()},
+                {server: m.monster_no for server, m in rebuilt_skill.server_skillups.items()})
+        self.assertNotIn('NA', skills[0].server_skillups)
+
+
+
+class Holder(object):
+    """Stands in for a cog which keeps a reference to a replaced database."""
+
+    def __init__(self, database):
+        self.database = database
+
+
+class RetiredGenerationTest(unittest.TestCase):
+    def test_describe_reports_what_holds_a_live_generation(self):
+        database = padguide2core.PgRawDatabase(skip_load=True)
+        holder = Holder(database)
+        retired = padguide2core.RetiredGeneration(3, database, None)
+        del database
+
+        description = retired.describe()
+        self.assertIn('Generation 3', description)
+        self.assertIn('database alive', description)
+        self.assertIn('Holder x1', description)
+
+        self.assertEqual(padguide2core.check_retired_generations([retired], 0), [retired])
+        self.assertTrue(retired.leak_reported)
+
+        del holder
+        self.assertEqual(padguide2core.check_retired_generations([retired], 0), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 from collections import defaultdict
 import os
 import re
+import threading
 
 import discord
 from discord.ext import commands
@@ -24,6 +25,9 @@ class Translate:
         self.service = None
         self.trySetupService()
 
+        # Services used by translate_jp_en_batch, one per calling thread
+        self._thread_services = threading.local()
+
     def trySetupService(self):
         api_key = self.settings.getKey()
         if api_key:
@@ -67,6 +71,25 @@ class Translate:
         result = self.service.translations().list(source='ja', target='en', format='text', q=query).execute()
         return result.get('translations')[0].get('translatedText')
 
+    def translate_jp_en_batch(self, queries):
+        """Translates a list of strings in one request. Returns None for each if no API key is set.
+
+        Can be called from several threads at once.
+        """
+        if not self.service:
+            return [None] * len(queries)
+        service = self.threadService()
+        result = service.translations().list(source='ja', target='en', format='text', q=list(queries)).execute()
+        return [t.get('translatedText') for t in result.get('translations')]
+
+    def threadService(self):
+        # The service's httplib2.Http isn't thread safe, so every thread gets its own
+        api_key = self.settings.getKey()
+        if getattr(self._thread_services, 'api_key', None) != api_key:
+            self._thread_services.service = build('translate', 'v2', developerKey=api_key)
+            self._thread_services.api_key = api_key
+        return self._thread_services.service
+
     def translateToEmbed(self, query):
         translation = self.translate_jp_en(query)
         return discord.Embed(description='**Original**\n`{}`\n\n**Translation**\n`{}`'.format(query, translation))